@@ -3,21 +3,277 @@ from __future__ import annotations
 
 import asyncio
 import base64
-import json
 import logging
-from typing import Any
+import random
+import re
+from collections import deque
+from contextlib import asynccontextmanager
+from itertools import chain
+from types import MappingProxyType
+from typing import Any, AsyncIterator, Awaitable, Callable, ClassVar, Mapping, TypeVar
 
 import aiohttp
-import requests
+import httpx
+import orjson
 
-from .const import API_BASE_URL, API_SESSION, API_CAPTCHA, API_DEVICE_LIST, API_DEVICE_STATUS, APP_ID
+from .const import (
+    API_BASE_URL,
+    API_SESSION,
+    API_CAPTCHA,
+    API_DEVICE_LIST,
+    API_DEVICE_STATUS,
+    API_DEVICE_TOTAL_WATER,
+    API_DEVICE_WATER,
+    API_DEVICE_MQTT,
+    APP_ID,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+# Full URLs, built once; device URLs are templates filled with format_map
+_URL_SESSION = API_BASE_URL + API_SESSION
+_URL_CAPTCHA = API_BASE_URL + API_CAPTCHA
+_URL_DEVICE_LIST = API_BASE_URL + API_DEVICE_LIST
+_URL_DEVICE_STATUS = API_BASE_URL + API_DEVICE_STATUS
+_URL_DEVICE_TOTAL_WATER = API_BASE_URL + API_DEVICE_TOTAL_WATER
+_URL_DEVICE_WATER = API_BASE_URL + API_DEVICE_WATER
+_URL_DEVICE_MQTT = API_BASE_URL + API_DEVICE_MQTT
+
+_PARAMS_TOTAL_WATER = MappingProxyType({"product_type": "WaterPurifier"})
+_PARAMS_WATER_PERIODS = tuple(
+    MappingProxyType({"product_type": "WaterPurifier", "period": period, "s_type": "water"})
+    for period in ("day", "week", "month")
+)
+
+# Response codes the API uses to reject an expired or invalid token
+_AUTH_ERROR_CODES = (401, 40001)
+
+# Client-side limits for the async API calls
+_MAX_CONCURRENCY = 8
+_REQUESTS_PER_MINUTE = 60
+
+_T = TypeVar("_T")
+
+_PHONE_RE = re.compile(r"^\+?(?:86)?0*(\d+)$")
+_PHONE_STRIP = str.maketrans("", "", " -")
+_BASE64_RE = re.compile(r"^[A-Za-z0-9+/=\s]+$")
+
+
+def _format_phone(raw: str) -> str:
+    """Normalize a phone number to the +86 form expected by the API."""
+    phone = raw.strip().translate(_PHONE_STRIP)
+    # Drop an existing country code and leading zeros, then add +86
+    match = _PHONE_RE.match(phone)
+    return "+86" + (match.group(1) if match else phone)
+
+
+def _is_success(result: dict[str, Any]) -> bool:
+    """Return True if an API response reports success."""
+    return result.get("code") == 0 or bool(result.get("success"))
+
+
+def _error_message(result: dict[str, Any]) -> str:
+    """Return the error message of a failed API response."""
+    return result.get("message") or result.get("msg") or result.get("error") or "Unknown error"
+
+
+def _decode_login_body(text: str, content_type: str) -> dict[str, Any]:
+    """Decode a login response body (JSON, base64-encoded JSON or plain text)."""
+    try:
+        if "application/json" in content_type or text.lstrip().startswith("{"):
+            return orjson.loads(text)
+        if _BASE64_RE.match(text):
+            # If response is not JSON, it might be base64 encoded
+            return orjson.loads(base64.b64decode(text))
+    except ValueError:
+        pass
+    return {"message": text, "raw": text}
+
+
+def _parse_login_response(result: dict[str, Any]) -> dict[str, Any]:
+    """Extract the session data from a login response, raising on failure."""
+    # Parse response - based on actual API response structure
+    if _is_success(result):
+        # Access token is in data.accessToken
+        data = result.get("data", {})
+        access_token = data.get("accessToken")
+        refresh_token = data.get("refreshToken")
+        user_id = data.get("userID")
+        
+        if not access_token:
+            # Try alternative: maybe the response itself is the token
+            if isinstance(result, str):
+                access_token = result
+            elif "data" in result and isinstance(result["data"], str):
+                access_token = result["data"]
+        
+        if access_token:
+            return {
+                "access_token": access_token,
+                "refresh_token": refresh_token,
+                "user_id": user_id,
+                "raw": result,
+            }
+        _LOGGER.error("Login response: %s", result)
+        raise Exception(f"Login failed: No token in response. Response: {_error_message(result)}")
+    
+    error_msg = _error_message(result)
+    _LOGGER.error("Login failed: %s, Response: %s", error_msg, result)
+    raise Exception(f"Login failed: {error_msg}")
+
+
+def _flatten_room_devices(data: Any) -> list[dict[str, Any]]:
+    """Collect the devices of every room in a device list response."""
+    if not isinstance(data, list):
+        return []
+    return list(chain.from_iterable(room.get("devices") or () for room in data))
+
+
+def _build_captcha_data(phone: str) -> dict[str, Any]:
+    """Build the captcha request body."""
+    return {
+        "account": phone,
+        "accountType": "mobile",
+        "areaCode": "+86",
+        "captchaType": "login"
+    }
+
+
+def _check_captcha_response(result: dict[str, Any], phone: str) -> bool:
+    """Check a captcha response, raising if the code was not sent."""
+    if _is_success(result):
+        _LOGGER.info("验证码已发送到 %s", phone)
+        return True
+    error_msg = _error_message(result)
+    _LOGGER.error("请求验证码失败: %s", error_msg)
+    raise Exception(f"请求验证码失败: {error_msg}")
+
+
+async def _read_json(response: aiohttp.ClientResponse) -> Any:
+    """Raise on an error status without reading the body, otherwise parse it with orjson."""
+    if response.status >= 400:
+        response.release()
+        raise aiohttp.ClientResponseError(
+            response.request_info,
+            response.history,
+            status=response.status,
+            message=response.reason or "",
+            headers=response.headers,
+        )
+    return await _parse_json(response)
+
+
+async def _parse_json(response: aiohttp.ClientResponse) -> Any:
+    """Parse the body with orjson, surfacing malformed JSON as an aiohttp.ClientError."""
+    body = await response.read()
+    try:
+        return orjson.loads(body)
+    except orjson.JSONDecodeError as err:
+        raise aiohttp.ContentTypeError(
+            response.request_info,
+            response.history,
+            status=response.status,
+            message=f"Invalid JSON: {err}",
+            headers=response.headers,
+        ) from err
+
+
+def _is_transient(err: BaseException) -> bool:
+    """Return True for errors worth retrying (connection problems, 429 and 5xx)."""
+    if isinstance(err, aiohttp.ClientResponseError):
+        return err.status == 429 or err.status >= 500
+    return isinstance(err, (aiohttp.ClientError, asyncio.TimeoutError))
+
+
+async def _aretry(
+    coro_factory: Callable[[], Awaitable[_T]], tries: int = 3, base: float = 0.5
+) -> _T:
+    """Await coro_factory(), retrying transient failures with jittered exponential backoff."""
+    for attempt in range(tries):
+        try:
+            return await coro_factory()
+        except Exception as err:
+            if attempt == tries - 1 or not _is_transient(err):
+                raise
+            delay = base * 2**attempt + random.uniform(0, 0.25)
+            _LOGGER.debug("Transient API error (%s), retrying in %.2f seconds", err, delay)
+            # Never time.sleep here: it would block the event loop
+            await asyncio.sleep(delay)
+
+
+class _AdaptiveLimiter:
+    """AIMD concurrency limiter with a sliding-window request cap.
+
+    The concurrency limit grows by 0.5 after each successful response and is
+    halved on 429/5xx responses or connection errors. A ``Retry-After`` header
+    blocks new requests until it expires.
+    """
+
+    def __init__(self, max_concurrency: int, requests_per_minute: int) -> None:
+        """Initialize the limiter."""
+        self._max_concurrency = max_concurrency
+        self._limit = float(max_concurrency)
+        self._requests_per_minute = requests_per_minute
+        self._in_flight = 0
+        self._condition = asyncio.Condition()
+        self._sent: deque[float] = deque()
+        self._blocked_until = 0.0
+
+    async def acquire(self) -> None:
+        """Wait for a free slot, the request window and any Retry-After delay."""
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_flight < int(self._limit))
+            self._in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            while True:
+                now = loop.time()
+                while self._sent and now - self._sent[0] >= 60:
+                    self._sent.popleft()
+                delay = self._blocked_until - now
+                if len(self._sent) >= self._requests_per_minute:
+                    delay = max(delay, self._sent[0] + 60 - now)
+                if delay <= 0:
+                    break
+                _LOGGER.debug("Rate limit reached, waiting %.1f seconds", delay)
+                await asyncio.sleep(delay)
+            self._sent.append(now)
+        except BaseException:
+            await self.release()
+            raise
+
+    async def release(self) -> None:
+        """Free the slot taken by acquire."""
+        async with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+    def feedback(self, status: int | None, headers: Mapping[str, str] | None = None) -> None:
+        """Adjust the limit from a response status (None for a connection error)."""
+        if status is None or status == 429 or status >= 500:
+            self._limit = max(1.0, self._limit * 0.5)
+            retry_after = headers.get("retry-after") if headers else None
+            if retry_after:
+                try:
+                    self._blocked_until = asyncio.get_running_loop().time() + float(retry_after)
+                except ValueError:
+                    pass
+        elif headers is None or headers.get("x-ratelimit-remaining") != "0":
+            self._limit = min(float(self._max_concurrency), self._limit + 0.5)
+
 
 class DeermaAPIClient:
     """Client for Deerma API."""
 
+    _BASE_HEADERS: ClassVar[Mapping[str, str]] = MappingProxyType({
+        "app_id": APP_ID,
+        "accept-language": "zh-CN",
+        "user-agent": "okhttp/4.12.0",
+    })
+    _JSON_HEADERS: ClassVar[Mapping[str, str]] = MappingProxyType({
+        "content-type": "application/json; charset=UTF-8",
+    })
+
     def __init__(self, phone: str, password: str = None, captcha: str = None, login_type: str = "password") -> None:
         """Initialize the API client.
         
@@ -31,45 +287,156 @@ class DeermaAPIClient:
         self.password = password
         self.captcha = captcha
         self.login_type = login_type  # "password" or "captcha"
-        self.token: str | None = None
+        self.token = None
         self.user_id: str | None = None
+        # Called with the session data after a rejected token was replaced by logging in again
+        self.token_refreshed_callback: Callable[[dict[str, Any]], None] | None = None
         self._session: aiohttp.ClientSession | None = None
+        self._login_lock = asyncio.Lock()
+        self._limiter = _AdaptiveLimiter(_MAX_CONCURRENCY, _REQUESTS_PER_MINUTE)
+        # Shared HTTP/2 client for the sync paths so requests reuse one TLS connection
+        self._sync_client: httpx.Client | None = None
+        self._account = _format_phone(phone)
+        # Fields of the login body that do not depend on the login type
+        self._login_body_template: dict[str, Any] = {
+            "account": self._account,
+            "language": "zh-CN",
+            "registrationId": "140fe1da9f81611e292",
+            "system": "android",
+        }
+
+    @property
+    def token(self) -> str | None:
+        """Return the current access token."""
+        return self._token
+
+    @token.setter
+    def token(self, value: str | None) -> None:
+        """Set the access token and cache its authorization header."""
+        self._token = value
+        self._auth_headers = {"authorization": f"Bearer {value}"}
 
     async def _get_session(self) -> aiohttp.ClientSession:
         """Get or create aiohttp session."""
         if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession()
+            connector = aiohttp.TCPConnector(
+                limit=32,
+                limit_per_host=8,
+                ttl_dns_cache=300,
+                keepalive_timeout=75,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=10),
+                headers=self._BASE_HEADERS,
+            )
         return self._session
 
+    @asynccontextmanager
+    async def _request(self, method: str, url: str, **kwargs: Any) -> AsyncIterator[aiohttp.ClientResponse]:
+        """Issue an async request through the rate limiter."""
+        session = await self._get_session()
+        await self._limiter.acquire()
+        response: aiohttp.ClientResponse | None = None
+        connection_failed = False
+        try:
+            async with session.request(method, url, **kwargs) as response:
+                yield response
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+            connection_failed = True
+            raise
+        finally:
+            # Feedback once per request, after the caller has consumed the body
+            if connection_failed:
+                self._limiter.feedback(None)
+            elif response is not None:
+                self._limiter.feedback(response.status, response.headers)
+            await self._limiter.release()
+
+    def _get_sync_client(self) -> httpx.Client:
+        """Get or create the sync HTTP client (loads certificates, so call from the executor)."""
+        if self._sync_client is None or self._sync_client.is_closed:
+            self._sync_client = httpx.Client(
+                http2=True,
+                timeout=10.0,
+                headers=self._BASE_HEADERS,
+                limits=httpx.Limits(max_keepalive_connections=4),
+            )
+        return self._sync_client
+
+    def _get_with_refresh(self, url: str, **kwargs: Any) -> dict[str, Any]:
+        """GET an authenticated endpoint, logging in again once if the token is rejected."""
+        for retry in (True, False):
+            response = self._get_sync_client().get(
+                url,
+                headers=self._auth_headers,
+                **kwargs,
+            )
+            if response.status_code != 401 or not retry:
+                response.raise_for_status()
+                result = orjson.loads(response.content)
+                if not retry or result.get("code") not in _AUTH_ERROR_CODES:
+                    return result
+            _LOGGER.debug("Access token rejected, logging in again")
+            self.login_sync()
+
+    @property
+    def can_login(self) -> bool:
+        """Return whether the credentials needed to log in again are available."""
+        return bool(self.captcha if self.login_type == "captcha" else self.password)
+
+    async def _aget_with_refresh(self, url: str, **kwargs: Any) -> dict[str, Any]:
+        """GET an authenticated endpoint, logging in again once if the token is rejected."""
+        # Without credentials a rejected token surfaces as a 401 ClientResponseError / error code
+        for retry in ((True, False) if self.can_login else (False,)):
+            token = self.token
+            async with self._request(
+                "GET",
+                url,
+                headers=self._auth_headers,
+                **kwargs,
+            ) as response:
+                if response.status != 401 or not retry:
+                    result = await _read_json(response)
+                    if not retry or result.get("code") not in _AUTH_ERROR_CODES:
+                        return result
+            await self._refresh_token(token)
+
+    async def _aget_json(self, url: str, **kwargs: Any) -> dict[str, Any]:
+        """GET an authenticated endpoint, retrying transient failures."""
+        return await _aretry(lambda: self._aget_with_refresh(url, **kwargs))
+
+    async def _refresh_token(self, rejected_token: str | None) -> None:
+        """Log in again unless a concurrent request already replaced the rejected token."""
+        async with self._login_lock:
+            if self.token == rejected_token:
+                _LOGGER.debug("Access token rejected, logging in again")
+                session_data = await self.login()
+                if self.token_refreshed_callback is not None:
+                    self.token_refreshed_callback(session_data)
+
+    async def __aenter__(self) -> DeermaAPIClient:
+        """Open the aiohttp session."""
+        await self._get_session()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        """Close the sessions."""
+        await self.close()
+
+    def close_sync(self) -> None:
+        """Close the sync client."""
+        if self._sync_client is not None:
+            self._sync_client.close()
+
     async def close(self) -> None:
         """Close the session."""
         if self._session and not self._session.closed:
             await self._session.close()
+        self.close_sync()
 
-    def login_sync(self) -> dict[str, Any]:
-        """Synchronous login method (for use with executor)."""
-        # Format phone number - ensure it has country code
-        phone = self.phone.strip().replace(" ", "").replace("-", "")
-        
-        # Handle different phone number formats
-        if phone.startswith("+86"):
-            # Already has country code
-            pass
-        elif phone.startswith("86") and len(phone) > 2:
-            # Has country code without +
-            phone = "+" + phone
-        elif phone.startswith("1") and len(phone) == 11:
-            # Chinese mobile number (11 digits starting with 1)
-            phone = "+86" + phone
-        elif phone.startswith("0"):
-            # Remove leading 0 and add country code
-            phone = "+86" + phone.lstrip("0")
-        else:
-            # Assume it's a Chinese number, add country code
-            phone = "+86" + phone
-        
-        _LOGGER.debug("Formatted phone number: %s (original: %s)", phone, self.phone)
-        
+    def _build_login_data(self) -> dict[str, Any]:
+        """Build the login request body for the configured login type."""
         # Prepare login data based on HAR file analysis
         # For password login: {"account":"+8618963907553","language":"zh-CN","pin":"flp2025","registrationId":"140fe1da9f81611e292","system":"android","verify":"password"}
         # For captcha login: {"account":"+8618963907553","language":"zh-CN","pin":"861838","registrationId":"140fe1da9f81611e292","system":"android","verify":"captcha"}
@@ -84,81 +451,65 @@ class DeermaAPIClient:
             pin = self.password
             verify = "password"
         
-        login_data = {
-            "account": phone,
-            "language": "zh-CN",
-            "pin": pin,
-            "registrationId": "140fe1da9f81611e292",
-            "system": "android",
-            "verify": verify
-        }
-        
-        headers = {
-            "app_id": APP_ID,
-            "accept-language": "zh-CN",
-            "content-type": "application/json; charset=UTF-8",
-            "user-agent": "okhttp/4.12.0",
-        }
+        login_data = self._login_body_template
+        login_data["pin"] = pin
+        login_data["verify"] = verify
         
-        _LOGGER.debug("Login request - phone: %s, type: %s, data: %s", phone, self.login_type, {**login_data, "pin": "***"})  # Hide password/captcha in log
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("Login request - phone: %s, type: %s, data: %s", self._account, self.login_type, {**login_data, "pin": "***"})  # Hide password/captcha in log
+        return login_data
+
+    def _apply_login_response(self, result: dict[str, Any]) -> dict[str, Any]:
+        """Store the token from a login response and return the session data."""
+        session_data = _parse_login_response(result)
+        self.token = session_data["access_token"]
+        self.user_id = session_data["user_id"]
+        return session_data
+
+    def login_sync(self) -> dict[str, Any]:
+        """Synchronous login method (for use with executor)."""
+        login_data = self._build_login_data()
         
         try:
             # Based on actual API, send JSON directly (not base64 encoded)
-            response = requests.post(
-                f"{API_BASE_URL}{API_SESSION}",
-                headers=headers,
-                json=login_data,  # Send as JSON directly
-                timeout=10,
+            response = self._get_sync_client().post(
+                _URL_SESSION,
+                headers=self._JSON_HEADERS,
+                content=orjson.dumps(login_data),  # Send as JSON directly
             )
             
-            result = {}
-            
-            _LOGGER.debug("Login response status: %s, headers: %s, body: %s", 
-                         response.status_code, dict(response.headers), response.text[:500])
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug("Login response status: %s, headers: %s, body: %s", 
+                             response.status_code, dict(response.headers), response.text[:500])
             
-            # Parse response
-            try:
-                result = response.json()
-            except:
-                # If response is not JSON, it might be base64 encoded
-                try:
-                    decoded = base64.b64decode(response.text).decode("utf-8")
-                    result = json.loads(decoded)
-                except:
-                    result = {"message": response.text, "raw": response.text}
+            return self._apply_login_response(
+                _decode_login_body(response.text, response.headers.get("content-type", ""))
+            )
+        except httpx.HTTPError as err:
+            _LOGGER.error("Error during login: %s", err)
+            raise
+        except Exception as err:
+            _LOGGER.error("Unexpected error during login: %s", err)
+            raise
+
+    async def login_async(self) -> dict[str, Any]:
+        """Login on the aiohttp session without occupying an executor thread."""
+        login_data = self._build_login_data()
+        try:
+            async with self._request(
+                "POST",
+                _URL_SESSION,
+                headers=self._JSON_HEADERS,
+                data=orjson.dumps(login_data),
+            ) as response:
+                text = await response.text()
+                content_type = response.headers.get("content-type", "")
+                if _LOGGER.isEnabledFor(logging.DEBUG):
+                    _LOGGER.debug("Login response status: %s, headers: %s, body: %s", 
+                                 response.status, dict(response.headers), text[:500])
             
-            # Parse response - based on actual API response structure
-            if result.get("code") == 0 or result.get("success"):
-                # Access token is in data.accessToken
-                data = result.get("data", {})
-                access_token = data.get("accessToken")
-                refresh_token = data.get("refreshToken")
-                user_id = data.get("userID")
-                
-                if not access_token:
-                    # Try alternative: maybe the response itself is the token
-                    if isinstance(result, str):
-                        access_token = result
-                    elif "data" in result and isinstance(result["data"], str):
-                        access_token = result["data"]
-                
-                if access_token:
-                    self.token = access_token
-                    self.user_id = user_id
-                    return {
-                        "access_token": access_token,
-                        "refresh_token": refresh_token,
-                        "user_id": user_id,
-                        "raw": result,
-                    }
-                else:
-                    _LOGGER.error("Login response: %s", result)
-                    raise Exception(f"Login failed: No token in response. Response: {result.get('message', 'Unknown error')}")
-            else:
-                error_msg = result.get("message") or result.get("msg") or result.get("error") or "Unknown error"
-                _LOGGER.error("Login failed: %s, Response: %s", error_msg, result)
-                raise Exception(f"Login failed: {error_msg}")
-        except requests.RequestException as err:
+            return self._apply_login_response(_decode_login_body(text, content_type))
+        except aiohttp.ClientError as err:
             _LOGGER.error("Error during login: %s", err)
             raise
         except Exception as err:
@@ -170,90 +521,54 @@ class DeermaAPIClient:
         if not self.token:
             self.login_sync()
         
-        headers = {
-            "app_id": APP_ID,
-            "accept-language": "zh-CN",
-            "authorization": f"Bearer {self.token}",
-            "user-agent": "okhttp/4.12.0",
-        }
-        
         try:
-            response = requests.get(
-                f"{API_BASE_URL}{API_DEVICE_LIST}",
-                headers=headers,
-                timeout=10,
-            )
-            response.raise_for_status()
-            result = response.json()
+            result = self._get_with_refresh(_URL_DEVICE_LIST)
             
-            _LOGGER.debug("Get devices response: code=%s, success=%s, data type=%s", 
-                         result.get("code"), result.get("success"), type(result.get("data")))
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug("Get devices response: code=%s, success=%s, data type=%s", 
+                             result.get("code"), result.get("success"), type(result.get("data")))
             
-            if result.get("code") == 0 or result.get("success"):
+            if _is_success(result):
                 # Based on actual API response, devices are in data[0].devices
-                data = result.get("data", [])
-                devices = []
-                if data and isinstance(data, list):
-                    for room_data in data:
-                        room_devices = room_data.get("devices", [])
-                        if room_devices:
-                            devices.extend(room_devices)
-                            _LOGGER.debug("Found %d devices in room", len(room_devices))
-                
-                _LOGGER.debug("Total devices found: %d", len(devices))
-                if devices:
-                    _LOGGER.debug("First device: %s", devices[0].get("device", {}).get("id", "unknown"))
+                devices = _flatten_room_devices(result.get("data"))
+                if _LOGGER.isEnabledFor(logging.DEBUG):
+                    _LOGGER.debug("Total devices found: %d", len(devices))
+                    if devices:
+                        _LOGGER.debug("First device: %s", devices[0].get("device", {}).get("id", "unknown"))
                 
                 return devices
             else:
-                error_msg = result.get("message") or "Unknown error"
+                error_msg = _error_message(result)
                 _LOGGER.warning("Failed to get devices: code=%s, message=%s, full response: %s", 
                                result.get("code"), error_msg, result)
                 return []
-        except requests.RequestException as err:
+        except httpx.HTTPError as err:
             _LOGGER.error("Error getting devices: %s", err)
             return []
 
+    def login_and_list_devices_sync(self) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+        """Log in and fetch the device list in one executor job."""
+        session_data = self.login_sync()
+        return session_data, self.get_devices_sync()
+
     async def login(self) -> dict[str, Any]:
         """Login and get session token (async version)."""
-        # Use sync version via executor to ensure consistency
-        return await asyncio.get_event_loop().run_in_executor(None, self.login_sync)
+        return await self.login_async()
 
     async def get_devices(self) -> list[dict[str, Any]]:
         """Get list of devices."""
         if not self.token:
             await self.login()
         
-        session = await self._get_session()
-        headers = {
-            "app_id": APP_ID,
-            "accept-language": "zh-CN",
-            "authorization": f"Bearer {self.token}",
-            "user-agent": "okhttp/4.12.0",
-        }
-        
         try:
-            async with session.get(
-                f"{API_BASE_URL}{API_DEVICE_LIST}",
-                headers=headers,
-                timeout=aiohttp.ClientTimeout(total=10),
-            ) as response:
-                response.raise_for_status()
-                result = await response.json()
-                
-                if result.get("code") == 0 or result.get("success"):
-                    # Based on actual API response, devices are in data[0].devices
-                    data = result.get("data", [])
-                    devices = []
-                    if data and isinstance(data, list):
-                        for room_data in data:
-                            room_devices = room_data.get("devices", [])
-                            if room_devices:
-                                devices.extend(room_devices)
-                    return devices
-                else:
-                    _LOGGER.warning("Failed to get devices: %s", result.get("message"))
-                    return []
+            result = await self._aget_json(_URL_DEVICE_LIST)
+            
+            if _is_success(result):
+                # Based on actual API response, devices are in data[0].devices
+                return _flatten_room_devices(result.get("data"))
+            else:
+                _LOGGER.warning("Failed to get devices: %s", _error_message(result))
+                return []
         except aiohttp.ClientError as err:
             _LOGGER.error("Error getting devices: %s", err)
             return []
@@ -263,180 +578,101 @@ class DeermaAPIClient:
         if not self.token:
             await self.login()
         
-        session = await self._get_session()
-        headers = {
-            "app_id": APP_ID,
-            "accept-language": "zh-CN",
-            "authorization": f"Bearer {self.token}",
-            "user-agent": "okhttp/4.12.0",
-        }
-        
         try:
-            async with session.get(
-                f"{API_BASE_URL}{API_DEVICE_STATUS}",
-                headers=headers,
+            result = await self._aget_json(
+                _URL_DEVICE_STATUS,
                 params={"device_id": device_id},
-                timeout=aiohttp.ClientTimeout(total=10),
-            ) as response:
-                response.raise_for_status()
-                result = await response.json()
-                
-                if result.get("code") == 0 or result.get("success"):
-                    return result.get("data", {}) or result
-                else:
-                    _LOGGER.warning("Failed to get device status: %s", result.get("message"))
-                    return {}
+            )
+            
+            if _is_success(result):
+                return result.get("data", {}) or result
+            else:
+                _LOGGER.warning("Failed to get device status: %s", _error_message(result))
+                return {}
         except aiohttp.ClientError as err:
             _LOGGER.error("Error getting device status: %s", err)
             return {}
 
     async def get_water_data(self, device_id: str) -> dict[str, Any]:
         """Get water usage data (total, daily, weekly, monthly)."""
+        water_data, _complete = await self.get_water_data_with_status(device_id)
+        return water_data
+
+    async def get_water_data_with_status(self, device_id: str) -> tuple[dict[str, Any], bool]:
+        """Get water usage data and whether all four requests succeeded."""
         if not self.token:
             await self.login()
         
-        session = await self._get_session()
-        headers = {
-            "app_id": APP_ID,
-            "accept-language": "zh-CN",
-            "authorization": f"Bearer {self.token}",
-            "user-agent": "okhttp/4.12.0",
-        }
-        
-        try:
-            # Get total water data
-            async with session.get(
-                f"{API_BASE_URL}/api/app/devices/{device_id}/totalWater?product_type=WaterPurifier",
-                headers=headers,
-                timeout=aiohttp.ClientTimeout(total=10),
-            ) as total_response:
-                total_response.raise_for_status()
-                total_data = await total_response.json()
-            
-            # Get daily data
-            async with session.get(
-                f"{API_BASE_URL}/api/app/devices/{device_id}/water/?product_type=WaterPurifier&period=day&s_type=water",
-                headers=headers,
-                timeout=aiohttp.ClientTimeout(total=10),
-            ) as daily_response:
-                daily_response.raise_for_status()
-                daily_data = await daily_response.json()
-            
-            # Get weekly data
-            async with session.get(
-                f"{API_BASE_URL}/api/app/devices/{device_id}/water/?product_type=WaterPurifier&period=week&s_type=water",
-                headers=headers,
-                timeout=aiohttp.ClientTimeout(total=10),
-            ) as weekly_response:
-                weekly_response.raise_for_status()
-                weekly_data = await weekly_response.json()
-            
-            # Get monthly data
-            async with session.get(
-                f"{API_BASE_URL}/api/app/devices/{device_id}/water/?product_type=WaterPurifier&period=month&s_type=water",
-                headers=headers,
-                timeout=aiohttp.ClientTimeout(total=10),
-            ) as monthly_response:
-                monthly_response.raise_for_status()
-                monthly_data = await monthly_response.json()
-            
-            return {
-                "total": total_data.get("data", {}),
-                "daily": daily_data.get("data", []),
-                "weekly": weekly_data.get("data", []),
-                "monthly": monthly_data.get("data", [])
-            }
-        except aiohttp.ClientError as err:
-            _LOGGER.error("Error getting water data: %s", err)
-            return {
-                "total": {},
-                "daily": [],
-                "weekly": [],
-                "monthly": []
-            }
+        url_args = {"device_id": device_id}
+        water_url = _URL_DEVICE_WATER.format_map(url_args)
+
+        # The four requests are independent, so run them concurrently
+        results = await asyncio.gather(
+            self._aget_json(_URL_DEVICE_TOTAL_WATER.format_map(url_args), params=_PARAMS_TOTAL_WATER),
+            *(self._aget_json(water_url, params=params) for params in _PARAMS_WATER_PERIODS),
+            return_exceptions=True,
+        )
+
+        water_data: dict[str, Any] = {}
+        complete = True
+        for key, default, result in zip(
+            ("total", "daily", "weekly", "monthly"), ({}, [], [], []), results
+        ):
+            if isinstance(result, aiohttp.ClientError):
+                _LOGGER.error("Error getting water data (%s): %s", key, result)
+                water_data[key] = default
+                complete = False
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                water_data[key] = result.get("data", default)
+                complete = complete and _is_success(result)
+        return water_data, complete
 
     def request_captcha_sync(self) -> bool:
         """Request captcha code (synchronous version)."""
-        phone = self.phone.strip().replace(" ", "").replace("-", "")
-        
-        # Format phone number
-        if phone.startswith("+86"):
-            pass
-        elif phone.startswith("86") and len(phone) > 2:
-            phone = "+" + phone
-        elif phone.startswith("1") and len(phone) == 11:
-            phone = "+86" + phone
-        elif phone.startswith("0"):
-            phone = "+86" + phone.lstrip("0")
-        else:
-            phone = "+86" + phone
-        
-        captcha_data = {
-            "account": phone,
-            "accountType": "mobile",
-            "areaCode": "+86",
-            "captchaType": "login"
-        }
-        
-        headers = {
-            "app_id": APP_ID,
-            "accept-language": "zh-CN",
-            "content-type": "application/json; charset=UTF-8",
-            "user-agent": "okhttp/4.12.0",
-        }
+        phone = self._account
         
         try:
-            response = requests.post(
-                f"{API_BASE_URL}{API_CAPTCHA}",
-                headers=headers,
-                json=captcha_data,
-                timeout=10,
+            response = self._get_sync_client().post(
+                _URL_CAPTCHA,
+                headers=self._JSON_HEADERS,
+                content=orjson.dumps(_build_captcha_data(phone)),
             )
-            
-            result = response.json()
-            
-            if result.get("code") == 0 or result.get("success"):
-                _LOGGER.info("验证码已发送到 %s", phone)
-                return True
-            else:
-                error_msg = result.get("message") or "Unknown error"
-                _LOGGER.error("请求验证码失败: %s", error_msg)
-                raise Exception(f"请求验证码失败: {error_msg}")
-        except requests.RequestException as err:
+            return _check_captcha_response(orjson.loads(response.content), phone)
+        except httpx.HTTPError as err:
             _LOGGER.error("请求验证码时出错: %s", err)
             raise
 
     async def request_captcha(self) -> bool:
         """Request captcha code (async version)."""
-        return await asyncio.get_event_loop().run_in_executor(None, self.request_captcha_sync)
+        phone = self._account
+        try:
+            async with self._request(
+                "POST",
+                _URL_CAPTCHA,
+                headers=self._JSON_HEADERS,
+                data=orjson.dumps(_build_captcha_data(phone)),
+            ) as response:
+                result = await _parse_json(response)
+            return _check_captcha_response(result, phone)
+        except aiohttp.ClientError as err:
+            _LOGGER.error("请求验证码时出错: %s", err)
+            raise
 
     async def get_mqtt_config(self, device_id: str) -> dict[str, Any]:
         """Get MQTT connection configuration for device."""
         if not self.token:
             await self.login()
         
-        session = await self._get_session()
-        headers = {
-            "app_id": APP_ID,
-            "accept-language": "zh-CN",
-            "authorization": f"Bearer {self.token}",
-            "user-agent": "okhttp/4.12.0",
-        }
-        
         try:
-            async with session.get(
-                f"{API_BASE_URL}/api/app/devices/{device_id}/mqtt",
-                headers=headers,
-                timeout=aiohttp.ClientTimeout(total=10),
-            ) as response:
-                response.raise_for_status()
-                result = await response.json()
-                
-                if result.get("code") == 0 or result.get("success"):
-                    return result.get("data", {})
-                else:
-                    _LOGGER.warning("Failed to get MQTT config: %s", result.get("message"))
-                    return {}
+            result = await self._aget_json(_URL_DEVICE_MQTT.format_map({"device_id": device_id}))
+            
+            if _is_success(result):
+                return result.get("data", {})
+            else:
+                _LOGGER.warning("Failed to get MQTT config: %s", _error_message(result))
+                return {}
         except aiohttp.ClientError as err:
             _LOGGER.error("Error getting MQTT config: %s", err)
             return {}
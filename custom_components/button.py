@@ -7,7 +7,6 @@ from typing import Any
 from homeassistant.components.button import ButtonEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
@@ -35,6 +34,9 @@ async def async_setup_entry(
 class DeermaBaseButton(CoordinatorEntity, ButtonEntity):
     """Base class for Deerma button entities."""
 
+    coordinator: DeermaWaterCoordinator
+    _suffix: str
+
     def __init__(
         self,
         coordinator: DeermaWaterCoordinator,
@@ -42,32 +44,18 @@ class DeermaBaseButton(CoordinatorEntity, ButtonEntity):
     ) -> None:
         """Initialize the button entity."""
         super().__init__(coordinator)
-        self.coordinator = coordinator
         self._entry = entry
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, coordinator.device_id or "unknown")},
-            name=coordinator.device_name or "飞利浦水健康",
-            manufacturer="Deerma",
-            model="Water Purifier",
-        )
+        self._attr_unique_id = f"{coordinator.device_id}_{self._suffix}"
+        self._attr_device_info = coordinator.device_info
 
 
 class DeermaQuick55Button(DeermaBaseButton):
     """Button for quick setting 55°C water temperature."""
 
-    _attr_unique_id = "deerma_quick_55"
+    _suffix = "quick_55"
     _attr_name = "一键55度"
     _attr_icon = "mdi:thermometer-water"
 
-    def __init__(
-        self,
-        coordinator: DeermaWaterCoordinator,
-        entry: ConfigEntry,
-    ) -> None:
-        """Initialize the quick 55°C button."""
-        super().__init__(coordinator, entry)
-        self._attr_unique_id = f"{coordinator.device_id}_quick_55"
-
     async def async_press(self) -> None:
         """Handle the button press."""
         # 55度对应代码 "6" (根据 valueMapping: "6": "55℃")
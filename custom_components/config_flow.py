@@ -11,7 +11,7 @@ from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import HomeAssistantError
 
-from .const import DOMAIN
+from .const import DOMAIN, DEFAULT_DEVICE_NAME
 from .api_client import DeermaAPIClient
 
 _LOGGER = logging.getLogger(__name__)
@@ -29,6 +29,12 @@ STEP_PASSWORD_SCHEMA = vol.Schema(
     }
 )
 
+STEP_CAPTCHA_PHONE_SCHEMA = vol.Schema(
+    {
+        vol.Required("phone"): str,
+    }
+)
+
 STEP_CAPTCHA_SCHEMA = vol.Schema(
     {
         vol.Required("phone"): str,
@@ -55,13 +61,13 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
         )
     
     try:
-        # Run login in executor to avoid blocking
-        session_data = await hass.async_add_executor_job(api_client.login_sync)
+        # Run login and get device list in one executor job to avoid blocking
+        session_data, devices = await hass.async_add_executor_job(
+            api_client.login_and_list_devices_sync
+        )
         if not session_data or not session_data.get("access_token"):
             raise InvalidAuth
         
-        # Get device list to verify connection
-        devices = await hass.async_add_executor_job(api_client.get_devices_sync)
         _LOGGER.debug("Devices retrieved: %d devices", len(devices) if devices else 0)
         if not devices or len(devices) == 0:
             _LOGGER.warning("No devices found for account %s", data["phone"])
@@ -74,7 +80,7 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
             device_id = device_info.get("id") or devices[0].get("device_id") or devices[0].get("id")
         
         return {
-            "title": f"飞利浦水健康 ({data['phone']})",
+            "title": f"{DEFAULT_DEVICE_NAME} ({data['phone']})",
             "access_token": session_data.get("access_token"),
             "refresh_token": session_data.get("refresh_token"),
             "user_id": session_data.get("user_id"),
@@ -86,6 +92,8 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
         if isinstance(err, (InvalidAuth, CannotConnect)):
             raise
         raise CannotConnect from err
+    finally:
+        api_client.close_sync()
 
 
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -171,13 +179,13 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 # Need phone number first
                 return self.async_show_form(
                     step_id="captcha_phone",
-                    data_schema=vol.Schema({vol.Required("phone"): str}),
+                    data_schema=STEP_CAPTCHA_PHONE_SCHEMA,
                 )
             
             # Request captcha
             try:
-                api_client = DeermaAPIClient(self.phone, login_type="captcha")
-                await api_client.request_captcha()
+                async with DeermaAPIClient(self.phone, login_type="captcha") as api_client:
+                    await api_client.request_captcha()
                 return self.async_show_form(
                     step_id="captcha",
                     data_schema=STEP_CAPTCHA_SCHEMA,
@@ -188,7 +196,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 errors["base"] = "captcha_request_failed"
                 return self.async_show_form(
                     step_id="captcha_phone",
-                    data_schema=vol.Schema({vol.Required("phone"): str}),
+                    data_schema=STEP_CAPTCHA_PHONE_SCHEMA,
                     errors=errors,
                 )
         
@@ -197,8 +205,8 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             # First step - save phone and request captcha
             self.phone = user_input["phone"]
             try:
-                api_client = DeermaAPIClient(self.phone, login_type="captcha")
-                await api_client.request_captcha()
+                async with DeermaAPIClient(self.phone, login_type="captcha") as api_client:
+                    await api_client.request_captcha()
                 return self.async_show_form(
                     step_id="captcha",
                     data_schema=STEP_CAPTCHA_SCHEMA,
@@ -209,7 +217,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 errors["base"] = "captcha_request_failed"
                 return self.async_show_form(
                     step_id="captcha_phone",
-                    data_schema=vol.Schema({vol.Required("phone"): str}),
+                    data_schema=STEP_CAPTCHA_PHONE_SCHEMA,
                     errors=errors,
                 )
         
@@ -3,12 +3,20 @@ from __future__ import annotations
 
 DOMAIN = "deerma_water"
 
+# Device registry defaults
+DEFAULT_DEVICE_NAME = "飞利浦水健康"
+MANUFACTURER = "Deerma"
+MODEL = "Water Purifier"
+
 # API endpoints
 API_BASE_URL = "https://iot.deerma.com"
 API_SESSION = "/api/app/session/"
 API_CAPTCHA = "/api/app/captcha"
 API_DEVICE_LIST = "/api/app/devices/"
 API_DEVICE_STATUS = "/api/app/device/status"
+API_DEVICE_TOTAL_WATER = "/api/app/devices/{device_id}/totalWater"
+API_DEVICE_WATER = "/api/app/devices/{device_id}/water/"
+API_DEVICE_MQTT = "/api/app/devices/{device_id}/mqtt"
 
 # App ID from HAR file
 APP_ID = "9c3b124649fa11e98b6e02461a5b364e"
@@ -1,20 +1,37 @@
 """Data update coordinator for Deerma Water Purifier."""
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
 from datetime import timedelta
+from types import MappingProxyType
+from typing import Any, Mapping
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
 from .api_client import DeermaAPIClient
-from .mqtt_client import DeermaMQTTClient
-from .const import DOMAIN
+from .mqtt_client import DeermaMQTTClient, temp_code_to_set_temp
+from .const import DOMAIN, ATTR_TOTAL_WATER, DEFAULT_DEVICE_NAME, MANUFACTURER, MODEL
 
 _LOGGER = logging.getLogger(__name__)
 
 SCAN_INTERVAL = timedelta(seconds=30)
+# While MQTT pushes device state, only the water usage totals need polling
+MQTT_SCAN_INTERVAL = timedelta(minutes=10)
+# Water usage totals change slowly, reuse them for this many seconds
+WATER_DATA_TTL = 300
+# MQTT reports arriving within this many seconds are applied as one update
+MQTT_COALESCE_DELAY = 0.1
+
+# Keys owned by the API refresh; everything else in the data came from MQTT
+_API_OWNED_KEYS = frozenset(("water_data", "device_id"))
+
+# Shared empty mapping for read-only fallbacks
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
 
 
 class DeermaWaterCoordinator(DataUpdateCoordinator):
@@ -27,6 +44,8 @@ class DeermaWaterCoordinator(DataUpdateCoordinator):
             _LOGGER,
             name=DOMAIN,
             update_interval=SCAN_INTERVAL,
+            # Only notify entities when a refresh actually changes the data
+            always_update=False,
         )
         self.entry = entry
         login_type = entry.data.get("login_type", "password")
@@ -46,42 +65,83 @@ class DeermaWaterCoordinator(DataUpdateCoordinator):
             self.api_client.token = entry.data["access_token"]
         if "user_id" in entry.data:
             self.api_client.user_id = entry.data["user_id"]
+        self.api_client.token_refreshed_callback = self._token_refreshed
         self.mqtt_client: DeermaMQTTClient | None = None
         self.device_id: str | None = entry.data.get("device_id")
         self.device_name: str | None = None
+        self._water_cache: tuple[float, dict] | None = None
+        self._pending_payload: dict = {}
+        self._flush_handle: asyncio.TimerHandle | None = None
+        # Parsed from water_data whenever a refresh lands
+        self.total_water: float | None = None
+        self.avg_tds: Any = 0.0
         
         # Initialize device from config
-        devices = entry.data.get("devices", [])
-        if devices and len(devices) > 0:
-            device_info = devices[0].get("device", {})
+        devices = entry.data.get("devices")
+        if devices:
+            dev0 = devices[0]
             if not self.device_id:
-                self.device_id = device_info.get("id") or devices[0].get("device_id") or devices[0].get("id")
-            self.device_name = devices[0].get("deviceNickname") or devices[0].get("name") or "飞利浦水健康"
+                device_info = dev0.get("device") or _EMPTY
+                self.device_id = device_info.get("id") or dev0.get("device_id") or dev0.get("id")
+            self.device_name = dev0.get("deviceNickname") or dev0.get("name") or DEFAULT_DEVICE_NAME
+        
+        # Shared by all entities of this device
+        self.device_info = DeviceInfo(
+            identifiers={(DOMAIN, self.device_id or "unknown")},
+            name=self.device_name or DEFAULT_DEVICE_NAME,
+            manufacturer=MANUFACTURER,
+            model=MODEL,
+        )
+
+    def _token_refreshed(self, session_data: dict[str, Any]) -> None:
+        """Persist a refreshed token so the MQTT client and the next restart use it."""
+        data = {**self.entry.data, "access_token": session_data["access_token"]}
+        if session_data.get("user_id"):
+            data["user_id"] = session_data["user_id"]
+        self.hass.config_entries.async_update_entry(self.entry, data=data)
+
+    @property
+    def safe_data(self) -> Mapping[str, Any]:
+        """Return the current data, or an empty mapping before the first refresh."""
+        return self.data if self.data else _EMPTY
 
     async def _async_update_data(self) -> dict:
         """Fetch data from API."""
+        # Don't start requests that would race with async_shutdown closing the session
+        if self.hass.is_stopping:
+            return self.data if self.data is not None else {}
         try:
             if not self.device_id:
-                return self.data or {}  # Return existing data if no device_id
-            
-            # Preserve existing MQTT data if available
-            existing_data = self.data or {}
-            mqtt_data = {k: v for k, v in existing_data.items() 
-                        if k not in ["water_data", "device_id"]}  # Keep MQTT data
+                return self.data if self.data is not None else {}  # Return existing data if no device_id
             
-            # Get water data (total, daily, weekly, monthly) like previous version
-            water_data = await self.api_client.get_water_data(self.device_id)
+            if self.mqtt_client and self.mqtt_client.connected:
+                # MQTT pushes device state, so only water data needs fetching
+                status = {}
+                water_data = await self._async_get_water_data()
+            else:
+                # Get water data (total, daily, weekly, monthly) and device status concurrently
+                status, water_data = await asyncio.gather(
+                    self.api_client.get_device_status(self.device_id),
+                    self._async_get_water_data(),
+                )
             
-            # Also get device status for real-time data
-            status = await self.api_client.get_device_status(self.device_id)
+            # Read the current data only now, so optimistic writes and MQTT flushes
+            # that landed while the requests were in flight are not rolled back
+            existing_data = self.data if self.data is not None else _EMPTY
             
-            # Merge: MQTT data (most recent) takes priority, then API status, then water_data
-            return {
-                "water_data": water_data,
-                "device_id": self.device_id,
-                **status,  # Merge status data
-                **mqtt_data,  # Merge MQTT data (overwrites status if same keys)
-            }
+            # Merge: fresh API status and water_data, then preserved MQTT data for keys the API didn't return
+            result = dict(status)
+            result["water_data"] = water_data
+            result["device_id"] = self.device_id
+            self._update_water_totals(water_data)
+            result.update(
+                (k, v) for k, v in existing_data.items()
+                if k not in _API_OWNED_KEYS and k not in status
+            )
+            # Keep the current object when nothing changed so the comparison stays cheap
+            if result == self.data:
+                return self.data
+            return result
         except Exception as err:
             # On error, return existing data to preserve state
             if self.data:
@@ -89,6 +149,30 @@ class DeermaWaterCoordinator(DataUpdateCoordinator):
                 return self.data
             raise UpdateFailed(f"Error communicating with API: {err}") from err
 
+    def _update_water_totals(self, water_data: dict) -> None:
+        """Parse the water usage totals once per refresh for the sensors."""
+        total_data = water_data.get("total")
+        # The API may return null (or something else) instead of an object
+        if not isinstance(total_data, dict):
+            total_data = _EMPTY
+        try:
+            self.total_water = float(total_data.get("totalWater", 0.0))
+        except (ValueError, TypeError):
+            self.total_water = None
+        self.avg_tds = total_data.get("averageTds", 0.0)
+
+    async def _async_get_water_data(self) -> dict:
+        """Get water data, reusing the cached copy while it is fresh."""
+        now = time.monotonic()
+        if self._water_cache is not None and now - self._water_cache[0] < WATER_DATA_TTL:
+            return self._water_cache[1]
+        
+        water_data, complete = await self.api_client.get_water_data_with_status(self.device_id)
+        # Don't cache a fetch where any of the requests failed, so the next refresh retries it
+        if complete:
+            self._water_cache = (now, water_data)
+        return water_data
+
     async def async_config_entry_first_refresh(self) -> None:
         """Refresh data for the first time."""
         # Only login if we don't have a token
@@ -106,6 +190,11 @@ class DeermaWaterCoordinator(DataUpdateCoordinator):
         if not self.device_id:
             _LOGGER.warning("Cannot setup MQTT: device_id is not available")
             return
+        if self.hass.is_stopping:
+            return
+        if self.mqtt_client is not None:
+            # Already set up, e.g. when the first refresh runs again on reload
+            return
         
         try:
             _LOGGER.info("Setting up MQTT client for device: %s", self.device_id)
@@ -117,6 +206,7 @@ class DeermaWaterCoordinator(DataUpdateCoordinator):
                 hass=self.hass,
                 device_id=self.device_id or "",
                 callback=self._mqtt_callback,
+                connection_callback=self._mqtt_connection_changed,
                 mqtt_config=mqtt_config,
                 config_entry=self.entry,
             )
@@ -131,14 +221,45 @@ class DeermaWaterCoordinator(DataUpdateCoordinator):
             _LOGGER.error("Failed to setup MQTT: %s", err, exc_info=True)
             self.mqtt_client = None
 
+    def _mqtt_connection_changed(self, connected: bool) -> None:
+        """Poll slowly while MQTT pushes state, and fall back to the normal interval otherwise."""
+        self.update_interval = MQTT_SCAN_INTERVAL if connected else SCAN_INTERVAL
+        _LOGGER.debug("MQTT %s, polling every %s", "connected" if connected else "disconnected", self.update_interval)
+        # The refresh already scheduled still uses the old interval, so poll now instead of
+        # leaving the status stale until it fires; skipped while shutting down
+        if not connected and self.mqtt_client is not None and not self.hass.is_stopping:
+            self.hass.async_create_task(self.async_request_refresh())
+
     def _mqtt_callback(self, payload: dict) -> None:
         """Handle MQTT message callback."""
-        # Merge MQTT payload with existing data to preserve API data (like water_data)
-        current_data = self.data or {}
-        merged_data = {
-            **current_data,  # Keep existing data (water_data, etc.)
-            **payload,  # Update with MQTT data (overwrites if same keys)
+        # A new total from the device makes the cached water data stale
+        if ATTR_TOTAL_WATER in payload and self._water_cache is not None:
+            cached_total = self._water_cache[1].get("total")
+            if not isinstance(cached_total, dict):
+                cached_total = _EMPTY
+            if payload[ATTR_TOTAL_WATER] != cached_total.get("totalWater"):
+                self._water_cache = None
+        # Skip reports that repeat the current (or already pending) state
+        current_data = self.data if self.data is not None else _EMPTY
+        pending = self._pending_payload
+        changed = {
+            k: v for k, v in payload.items()
+            if pending.get(k, current_data.get(k)) != v
         }
+        if not changed:
+            return
+        # Collect bursts of reports and notify entities once
+        pending.update(changed)
+        if self._flush_handle is None:
+            self._flush_handle = self.hass.loop.call_later(MQTT_COALESCE_DELAY, self._flush_mqtt)
+
+    def _flush_mqtt(self) -> None:
+        """Apply the MQTT reports collected since the last flush."""
+        self._flush_handle = None
+        payload, self._pending_payload = self._pending_payload, {}
+        # Merge MQTT payload with existing data to preserve API data (like water_data)
+        merged_data = dict(self.data if self.data is not None else _EMPTY)  # Keep existing data (water_data, etc.)
+        merged_data.update(payload)  # Update with MQTT data (overwrites if same keys)
         # Update coordinator data with merged payload
         self.async_set_updated_data(merged_data)
 
@@ -147,17 +268,42 @@ class DeermaWaterCoordinator(DataUpdateCoordinator):
         if not self.device_id or not self.mqtt_client:
             _LOGGER.warning("MQTT client not available, cannot set temperature")
             return False
-        return await self.mqtt_client.async_set_temperature(temp_code)
+        if not await self.mqtt_client.async_set_temperature(temp_code):
+            return False
+        # Show the new setting right away instead of waiting for the device to report it
+        # Use the code the MQTT client actually sent, and drop any buffered report that predates it
+        self._pending_payload.pop("SetTemp", None)
+        data = dict(self.data if self.data is not None else _EMPTY)
+        data["SetTemp"] = temp_code_to_set_temp(temp_code)
+        self.async_set_updated_data(data)
+        return True
 
     async def async_set_water_volume(self, volume_code: str) -> bool:
         """Set water volume setting via MQTT."""
         if not self.device_id or not self.mqtt_client:
             _LOGGER.warning("MQTT client not available, cannot set water volume")
             return False
-        return await self.mqtt_client.async_set_volume(volume_code)
+        if not await self.mqtt_client.async_set_volume(volume_code):
+            return False
+        # Show the new setting right away instead of waiting for the device to report it
+        self._pending_payload.pop("SetOutlet", None)
+        data = dict(self.data if self.data is not None else _EMPTY)
+        data["SetOutlet"] = int(volume_code)
+        self.async_set_updated_data(data)
+        return True
 
     async def async_shutdown(self) -> None:
         """Shutdown coordinator."""
-        if self.mqtt_client:
-            await self.mqtt_client.disconnect()
-        await self.api_client.close()
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        mqtt_client, self.mqtt_client = self.mqtt_client, None
+        # The broker connection and the HTTP session are independent, close them together
+        results = await asyncio.gather(
+            mqtt_client.disconnect() if mqtt_client else asyncio.sleep(0),
+            self.api_client.close(),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                _LOGGER.warning("Error during shutdown: %s", result)
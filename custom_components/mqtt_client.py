@@ -2,18 +2,87 @@
 from __future__ import annotations
 
 import asyncio
-import json
+import contextlib
+import functools
 import logging
+import random
 import socket
+import ssl
+import struct
 import time
-from typing import Any, Callable, Optional
+from typing import Any, Awaitable, Callable, Optional
 
+import orjson
 import websockets
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 _LOGGER = logging.getLogger(__name__)
 
+# MQTT 的两字节大端长度/报文标识字段
+_U16 = struct.Struct(">H")
+# 小于 128 的剩余长度只占一个字节，预先生成
+_ONE_BYTE = tuple(bytes((i,)) for i in range(128))
+# 剩余长度为单字节时的 PUBLISH 报头：(剩余长度, 主题长度)
+_PUBLISH_HEAD = struct.Struct(">xBH")
+
+# 断线重连的指数退避范围（秒）
+_RECONNECT_MIN_DELAY = 5
+_RECONNECT_MAX_DELAY = 60
+# MQTT 配置（endpoint、clientID、WSS 地址）的缓存时间（秒）
+_MQTT_CONFIG_TTL = 600
+# 等待 CONNACK 的超时时间（秒）
+_CONNACK_TIMEOUT = 10
+# 在这段时间（秒）内连续下发的控制指令合并为一个 PUBLISH
+_TX_COALESCE_DELAY = 0.05
+
+
+@functools.lru_cache(maxsize=1)
+def _ssl_context() -> ssl.SSLContext:
+    """创建 SSL 上下文（读取系统证书较慢，整个进程只创建一次）"""
+    return ssl.create_default_context()
+
+
+@functools.lru_cache(maxsize=256)
+def _encode_remaining_length(length: int) -> bytes:
+    """编码 MQTT 剩余长度（支持多字节编码）"""
+    if length < 128:
+        return _ONE_BYTE[length]
+    encoded = bytearray()
+    while True:
+        byte = length % 128
+        length = length // 128
+        if length > 0:
+            byte = byte | 0x80
+        encoded.append(byte)
+        if length == 0:
+            break
+    return bytes(encoded)
+
+
+def temp_code_to_set_temp(temp_code: str) -> int:
+    """把水温代码转换为 SetTemp 值（代码为 "0"-"10"，其他值按 0 处理）"""
+    target_temp = int(temp_code) if temp_code.isdigit() else 0
+    if target_temp > 10:
+        _LOGGER.debug("水温代码超出范围: %s，按 0 处理", temp_code)
+        return 0
+    return target_temp
+
+
+def _parse_remaining_length(packet: bytes, start_pos: int) -> tuple:
+    """解析 MQTT 剩余长度，返回 (剩余长度, 下一个位置)"""
+    pos = start_pos
+    remaining_length = 0
+    multiplier = 1
+    while pos < len(packet) and pos < start_pos + 4:
+        byte = packet[pos]
+        remaining_length += (byte & 0x7F) * multiplier
+        multiplier *= 128
+        pos += 1
+        if (byte & 0x80) == 0:
+            break
+    return remaining_length, pos
+
 
 class DeermaMQTTClient:
     """MQTT client for Deerma devices using AWS IoT WebSocket."""
@@ -25,25 +94,80 @@ class DeermaMQTTClient:
         callback: Callable[[dict[str, Any]], None],
         mqtt_config: Optional[dict] = None,
         config_entry: Optional[Any] = None,
+        connection_callback: Optional[Callable[[bool], None]] = None,
     ) -> None:
         """Initialize MQTT client."""
         self.hass = hass
         self.device_id = device_id
         self.callback = callback
+        self.connection_callback = connection_callback
         self.mqtt_config = mqtt_config or {}
         self.config_entry = config_entry
         self._websocket: Optional[websockets.WebSocketClientProtocol] = None
-        self.connected = False
+        # 当前连接的 send 方法，避免每次发送都查找属性
+        self._send: Optional[Callable[[bytes], Awaitable[None]]] = None
+        self._connected = False
         self._connect_lock = asyncio.Lock()
         self._listen_task: Optional[asyncio.Task] = None
+        self._connack_event = asyncio.Event()
+        self._connack_code: Optional[int] = None
         self._listening = False
+        self._reconnect_task: Optional[asyncio.Task] = None
+        # 控制指令队列：(desired 字段, 发送结果 future)，由单一发送任务处理
+        self._tx_queue: asyncio.Queue[tuple[dict[str, int], asyncio.Future]] = asyncio.Queue()
+        self._writer_task: Optional[asyncio.Task] = None
+        self._stopping = False
         self._session = async_get_clientsession(hass)
+        self._mqtt_config_cache: Optional[tuple[float, dict]] = None
         
         # MQTT主题配置（基于AWS IoT Shadow）
         self.command_topic = f"$aws/things/{device_id}/shadow/update"
         self.state_topic = f"$aws/things/{device_id}/shadow/get/accepted"
         self.response_topic = f"$aws/things/{device_id}/shadow/update/accepted"
         self.get_topic = f"$aws/things/{device_id}/shadow/get"
+        self._subscribe_topics = (
+            f"$aws/things/{device_id}/shadow/get/#",
+            f"$aws/things/{device_id}/shadow/update/accepted",
+        )
+        # 携带设备状态的主题，与收到的主题字节直接比较
+        self._accept_topic_bytes = frozenset(
+            topic.encode("utf-8") for topic in (self.state_topic, self.response_topic)
+        )
+        
+        # 主题和设备固定，相关的数据包片段只构建一次
+        self._subscribe_packet = self._build_mqtt_subscribe_packet(
+            [(topic, 1) for topic in self._subscribe_topics]
+        )
+        # 发布主题的长度前缀 + 主题字节
+        self._topic_fields = {}
+        for topic in (self.command_topic, self.get_topic):
+            topic_bytes = topic.encode("utf-8")
+            self._topic_fields[topic] = _U16.pack(len(topic_bytes)) + topic_bytes
+        self._get_state_packet = self._build_mqtt_publish_packet(self.get_topic, {}, packet_id=3)
+        # 控制指令 payload 的固定部分，只有设置的字段和值会变化
+        self._cmd_prefix = (
+            b'{"state":{"desired":{"CommandType":"app","EnduserId":'
+            + orjson.dumps(device_id)
+            + b","
+        )
+        self._cmd_suffix = b"}}}"
+        # CONNECT + SUBSCRIBE + 请求设备状态，依赖 clientID
+        self._setup_packet: Optional[bytes] = None
+        self._setup_client_id: Optional[str] = None
+
+    @property
+    def connected(self) -> bool:
+        """Return whether the MQTT connection is up."""
+        return self._connected
+
+    @connected.setter
+    def connected(self, value: bool) -> None:
+        """Set the connection state and notify connection_callback on change."""
+        if value == self._connected:
+            return
+        self._connected = value
+        if self.connection_callback:
+            self.connection_callback(value)
 
     def _get_latest_access_token(self) -> Optional[str]:
         """从配置项中获取最新的 access_token"""
@@ -100,134 +224,113 @@ class DeermaMQTTClient:
             _LOGGER.error("获取MQTT配置时发生错误: %s", err)
             return {}
 
-    def _encode_mqtt_remaining_length(self, length: int) -> bytes:
-        """编码 MQTT 剩余长度（支持多字节编码）"""
-        encoded = bytearray()
-        while True:
-            byte = length % 128
-            length = length // 128
-            if length > 0:
-                byte = byte | 0x80
-            encoded.append(byte)
-            if length == 0:
-                break
-        return bytes(encoded)
+    async def _get_mqtt_config(self) -> dict:
+        """获取MQTT配置，缓存未过期时直接复用"""
+        now = time.monotonic()
+        if self._mqtt_config_cache is not None and now - self._mqtt_config_cache[0] < _MQTT_CONFIG_TTL:
+            return self._mqtt_config_cache[1]
+        
+        config = await self._get_mqtt_config_from_api()
+        # 获取失败时不缓存
+        if config:
+            self._mqtt_config_cache = (now, config)
+        return config
 
     def _build_mqtt_connect_packet(self, client_id: str) -> bytes:
         """构建 MQTT CONNECT 数据包"""
         client_id_bytes = client_id.encode("utf-8")
         protocol_name = b"MQTT"
         remaining_length = 2 + len(protocol_name) + 1 + 1 + 2 + 2 + len(client_id_bytes)
-        remaining_length_bytes = self._encode_mqtt_remaining_length(remaining_length)
-        fixed_header = bytes([0x10]) + remaining_length_bytes
-        
-        protocol_name_length = bytes([len(protocol_name) >> 8, len(protocol_name) & 0xFF])
-        protocol_level = bytes([0x04])  # MQTT 3.1.1
-        connect_flags = bytes([0x02])   # 清理会话
-        keep_alive = bytes([0x00, 0x3C])  # 60秒
-        
-        client_id_length = bytes([len(client_id_bytes) >> 8, len(client_id_bytes) & 0xFF])
         
-        packet = (
-            fixed_header
-            + protocol_name_length
-            + protocol_name
-            + protocol_level
-            + connect_flags
-            + keep_alive
-            + client_id_length
-            + client_id_bytes
-        )
-        return packet
-
-    def _build_mqtt_subscribe_packet(self, topic: str, packet_id: int = 1) -> bytes:
-        """构建 MQTT SUBSCRIBE 数据包"""
-        topic_bytes = topic.encode("utf-8")
-        remaining_length = 2 + 2 + len(topic_bytes) + 1
-        remaining_length_bytes = self._encode_mqtt_remaining_length(remaining_length)
-        fixed_header = bytes([0x82]) + remaining_length_bytes  # SUBSCRIBE + QoS 1
-        
-        packet_id_bytes = bytes([packet_id >> 8, packet_id & 0xFF])
-        topic_length = bytes([len(topic_bytes) >> 8, len(topic_bytes) & 0xFF])
-        qos = bytes([0x01])  # QoS 1
+        buf = bytearray((0x10,))
+        buf += _encode_remaining_length(remaining_length)
+        buf += _U16.pack(len(protocol_name))
+        buf += protocol_name
+        buf.append(0x04)  # MQTT 3.1.1
+        buf.append(0x02)  # 清理会话
+        buf += b"\x00\x3C"  # 60秒
+        buf += _U16.pack(len(client_id_bytes))
+        buf += client_id_bytes
+        return bytes(buf)
+
+    def _build_mqtt_subscribe_packet(self, topics: list[tuple[str, int]], packet_id: int = 1) -> bytes:
+        """构建 MQTT SUBSCRIBE 数据包（一个包内可订阅多个主题）"""
+        encoded_topics = [(topic.encode("utf-8"), qos) for topic, qos in topics]
+        remaining_length = 2 + sum(2 + len(topic_bytes) + 1 for topic_bytes, _ in encoded_topics)
         
-        packet = (
-            fixed_header
-            + packet_id_bytes
-            + topic_length
-            + topic_bytes
-            + qos
-        )
-        return packet
+        buf = bytearray((0x82,))  # SUBSCRIBE + QoS 1
+        buf += _encode_remaining_length(remaining_length)
+        buf += _U16.pack(packet_id)
+        for topic_bytes, qos in encoded_topics:
+            buf += _U16.pack(len(topic_bytes))
+            buf += topic_bytes
+            buf.append(qos)
+        return bytes(buf)
 
     def _build_mqtt_publish_packet(self, topic: str, payload: dict, packet_id: int = 2) -> bytes:
         """构建 MQTT PUBLISH 数据包（QoS 1）"""
-        payload_str = json.dumps(payload, separators=(',', ':'))
-        payload_bytes = payload_str.encode("utf-8")
-        topic_bytes = topic.encode("utf-8")
-        
-        remaining_length = 2 + len(topic_bytes) + 2 + len(payload_bytes)
-        remaining_length_bytes = self._encode_mqtt_remaining_length(remaining_length)
-        fixed_header = bytes([0x32]) + remaining_length_bytes  # PUBLISH + QoS 1
+        return self._build_mqtt_publish_packet_raw(topic, orjson.dumps(payload), packet_id)
+
+    def _build_mqtt_publish_packet_raw(self, topic: str, payload_bytes: bytes, packet_id: int = 2) -> bytes:
+        """用已序列化的 payload 构建 MQTT PUBLISH 数据包（QoS 1）"""
+        topic_field = self._topic_fields.get(topic)
+        if topic_field is None:
+            topic_bytes = topic.encode("utf-8")
+            topic_field = _U16.pack(len(topic_bytes)) + topic_bytes
         
-        topic_length = bytes([len(topic_bytes) >> 8, len(topic_bytes) & 0xFF])
-        packet_id_bytes = bytes([packet_id >> 8, packet_id & 0xFF])
+        remaining_length = len(topic_field) + 2 + len(payload_bytes)
         
-        packet = (
-            fixed_header
-            + topic_length
-            + topic_bytes
-            + packet_id_bytes
-            + payload_bytes
-        )
-        return packet
-
-    def _parse_mqtt_remaining_length(self, packet: bytes, start_pos: int) -> tuple:
-        """解析 MQTT 剩余长度，返回 (剩余长度, 下一个位置)"""
-        pos = start_pos
-        remaining_length = 0
-        multiplier = 1
-        while pos < len(packet) and pos < start_pos + 4:
-            byte = packet[pos]
-            remaining_length += (byte & 0x7F) * multiplier
-            multiplier *= 128
-            pos += 1
-            if (byte & 0x80) == 0:
-                break
-        return remaining_length, pos
+        buf = bytearray((0x32,))  # PUBLISH + QoS 1
+        buf += _encode_remaining_length(remaining_length)
+        buf += topic_field
+        buf += _U16.pack(packet_id)
+        buf += payload_bytes
+        return bytes(buf)
 
-    def _parse_mqtt_publish_packet(self, packet: bytes) -> tuple:
-        """解析 MQTT PUBLISH 数据包，返回 (topic, payload)"""
+    def _build_command_payload(self, desired: dict[str, int]) -> bytes:
+        """按模板生成设置 desired 状态的 payload"""
+        fields = b",".join(b'"%b":%d' % (field.encode("utf-8"), value) for field, value in desired.items())
+        return self._cmd_prefix + fields + self._cmd_suffix
+
+    def _parse_mqtt_publish_header(self, packet: bytes) -> tuple:
+        """解析 MQTT PUBLISH 报头，返回 (topic 字节, payload 起始位置, payload 结束位置)，不解码 payload"""
         if len(packet) < 4:
-            return None, None
-        
-        remaining_length, pos = self._parse_mqtt_remaining_length(packet, 1)
+            return None, 0, 0
         
-        if pos + 2 > len(packet) or remaining_length == 0:
-            return None, None
-        
-        topic_length = (packet[pos] << 8) | packet[pos + 1]
-        pos += 2
+        if packet[1] < 0x80:
+            # 常见情况：剩余长度只占一个字节，一次解析出剩余长度和主题长度
+            remaining_length, topic_length = _PUBLISH_HEAD.unpack_from(packet)
+            pos = 4
+            if remaining_length == 0:
+                return None, 0, 0
+        else:
+            remaining_length, pos = _parse_remaining_length(packet, 1)
+            
+            if pos + 2 > len(packet) or remaining_length == 0:
+                return None, 0, 0
+            
+            topic_length, = _U16.unpack_from(packet, pos)
+            pos += 2
         
         if pos + topic_length > len(packet):
-            return None, None
+            return None, 0, 0
         
-        topic = packet[pos:pos + topic_length].decode("utf-8", errors="ignore")
+        topic_bytes = bytes(packet[pos:pos + topic_length])
         pos += topic_length
         
         qos = (packet[0] & 0x06) >> 1
         if qos >= 1:
             if pos + 2 > len(packet):
-                return None, None
+                return None, 0, 0
             pos += 2
         
         payload_length = remaining_length - 2 - topic_length - (2 if qos >= 1 else 0)
         if payload_length < 0 or pos + payload_length > len(packet):
-            payload_bytes = packet[pos:]
+            payload_end = len(packet)
         else:
-            payload_bytes = packet[pos:pos + payload_length]
+            payload_end = pos + payload_length
         
-        return topic, payload_bytes
+        return topic_bytes, pos, payload_end
 
     def _handle_mqtt_packet(self, packet: bytes):
         """处理 MQTT 数据包"""
@@ -239,6 +342,8 @@ class DeermaMQTTClient:
         if packet_type == 0x02:  # CONNACK
             if len(packet) >= 4:
                 connack_code = packet[3]
+                self._connack_code = connack_code
+                self._connack_event.set()
                 if connack_code == 0:
                     _LOGGER.info("MQTT 连接已确认")
                 else:
@@ -246,14 +351,17 @@ class DeermaMQTTClient:
         elif packet_type == 0x09:  # SUBACK
             _LOGGER.debug("MQTT 订阅成功")
         elif packet_type == 0x03:  # PUBLISH
-            topic, payload_bytes = self._parse_mqtt_publish_packet(packet)
-            if topic and payload_bytes:
-                _LOGGER.debug("收到 PUBLISH 消息，主题: %s", topic)
+            # memoryview 切片不复制数据，orjson 可直接解析
+            packet = memoryview(packet)
+            topic_bytes, payload_start, payload_end = self._parse_mqtt_publish_header(packet)
+            if topic_bytes and payload_start < payload_end:
+                if _LOGGER.isEnabledFor(logging.DEBUG):
+                    _LOGGER.debug("收到 PUBLISH 消息，主题: %s", topic_bytes.decode("utf-8", errors="ignore"))
                 
-                if "/shadow/get/accepted" in topic or "/shadow/update/accepted" in topic:
+                # 只解析关心的主题的 payload
+                if topic_bytes in self._accept_topic_bytes:
                     try:
-                        payload_str = payload_bytes.decode("utf-8")
-                        payload_data = json.loads(payload_str)
+                        payload_data = orjson.loads(packet[payload_start:payload_end])
                         
                         # Handle both /shadow/get/accepted and /shadow/update/accepted
                         # /shadow/get/accepted has reported state
@@ -272,7 +380,8 @@ class DeermaMQTTClient:
 
     async def _listen_messages(self):
         """监听 WebSocket 消息"""
-        if not self._websocket or not self.connected:
+        websocket = self._websocket
+        if not websocket:
             return
         
         if self._listening:
@@ -280,9 +389,10 @@ class DeermaMQTTClient:
         
         self._listening = True
         try:
-            while self.connected and self._websocket:
+            # 跟随 WebSocket 而不是 connected，CONNACK 到达前也要接收
+            while self._websocket is websocket:
                 try:
-                    message = await self._websocket.recv()
+                    message = await websocket.recv()
                     
                     if isinstance(message, bytes):
                         self._handle_mqtt_packet(message)
@@ -300,13 +410,27 @@ class DeermaMQTTClient:
         finally:
             self._listening = False
             self.connected = False
-            # 自动重连
-            for delay in [5, 10, 15, 30]:
-                if not self.connected:
-                    _LOGGER.info("尝试重连 WebSocket，延迟 %s 秒", delay)
-                    await asyncio.sleep(delay)
-                    if await self.connect():
-                        break
+        # 已建立的连接意外断开时自动重连；任务被取消时不会执行到这里。
+        # 未收到成功的 CONNACK 时由 connect() 的调用方处理失败
+        if not self._stopping and self._connack_code == 0:
+            self._start_reconnect()
+
+    def _start_reconnect(self) -> None:
+        """启动重连任务（同一时间只有一个）"""
+        if self._reconnect_task is None or self._reconnect_task.done():
+            self._reconnect_task = self.hass.async_create_background_task(
+                self._reconnect(), f"deerma_mqtt_reconnect_{self.device_id}"
+            )
+
+    async def _reconnect(self) -> None:
+        """按指数退避（带随机抖动）重连，直到成功或客户端断开"""
+        delay = _RECONNECT_MIN_DELAY
+        while not self._stopping and not self.connected:
+            _LOGGER.info("尝试重连 WebSocket，延迟 %s 秒", delay)
+            await asyncio.sleep(delay + random.random())
+            if self._stopping or self.connected or await self.connect():
+                break
+            delay = min(_RECONNECT_MAX_DELAY, delay * 2)
 
     async def connect(self) -> bool:
         """连接 MQTT broker via WebSocket"""
@@ -318,10 +442,16 @@ class DeermaMQTTClient:
             if self.connected:
                 return True
             
+            # 确保旧的监听任务已经结束，同一时间只有一个监听任务
+            if self._listen_task and not self._listen_task.done():
+                self._listen_task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await self._listen_task
+            
             try:
                 _LOGGER.info("开始连接MQTT WebSocket，device_id=%s", self.device_id)
                 
-                mqtt_config = await self._get_mqtt_config_from_api()
+                mqtt_config = await self._get_mqtt_config()
                 if not mqtt_config:
                     _LOGGER.error("无法获取MQTT配置")
                     return False
@@ -335,13 +465,9 @@ class DeermaMQTTClient:
                 _LOGGER.debug("使用 WSS URL: %s, clientID: %s", wss_url[:50] + "...", client_id)
                 
                 # 建立 WebSocket 连接
-                import ssl
-                def _create_ssl_context():
-                    return ssl.create_default_context()
-                
-                ssl_context = await self.hass.async_add_executor_job(_create_ssl_context)
+                ssl_context = await self.hass.async_add_executor_job(_ssl_context)
                 
-                self._websocket = await websockets.connect(
+                self._websocket = websocket = await websockets.connect(
                     wss_url,
                     subprotocols=["mqtt"],
                     open_timeout=30,
@@ -351,95 +477,67 @@ class DeermaMQTTClient:
                     ssl=ssl_context
                 )
                 
-                self.connected = True
+                self._send = websocket.send
                 _LOGGER.info("WebSocket 连接成功")
                 
-                # 发送 MQTT CONNECT 包
-                connect_packet = self._build_mqtt_connect_packet(client_id)
-                await self._websocket.send(connect_packet)
-                _LOGGER.debug("已发送 MQTT CONNECT 包")
-                
-                # 等待连接确认
-                await asyncio.sleep(0.5)
-                
-                # 订阅主题
-                subscribe_topics = [
-                    f"$aws/things/{self.device_id}/shadow/get/#",
-                    f"$aws/things/{self.device_id}/shadow/update/accepted"
-                ]
-                for i, topic in enumerate(subscribe_topics, 1):
-                    subscribe_packet = self._build_mqtt_subscribe_packet(topic, packet_id=i)
-                    await self._websocket.send(subscribe_packet)
-                    _LOGGER.debug("已订阅主题: %s", topic)
-                
-                # 启动消息监听任务
-                if self._listen_task and not self._listen_task.done():
-                    try:
-                        self._listen_task.cancel()
-                    except Exception:
-                        pass
-                
+                # 先启动消息监听任务，以便收到 CONNACK
+                self._connack_event.clear()
+                self._connack_code = None
                 self._listen_task = self.hass.async_create_task(self._listen_messages())
                 
-                # 请求当前设备状态
-                await self._request_device_state()
+                # CONNECT、订阅主题和请求设备状态合并为一帧发送，broker 按顺序处理
+                if self._setup_packet is None or self._setup_client_id != client_id:
+                    self._setup_packet = (
+                        self._build_mqtt_connect_packet(client_id)
+                        + self._subscribe_packet
+                        + self._get_state_packet
+                    )
+                    self._setup_client_id = client_id
+                await self._send(self._setup_packet)
+                _LOGGER.debug("已发送 MQTT CONNECT 包，订阅主题: %s，并请求设备状态", self._subscribe_topics)
+                
+                # 等待连接确认
+                await asyncio.wait_for(self._connack_event.wait(), _CONNACK_TIMEOUT)
+                if self._connack_code != 0:
+                    raise ConnectionError(f"CONNACK 代码: 0x{self._connack_code:02X}")
                 
+                # broker 确认后才算连接成功（会通知 connection_callback）
+                self.connected = True
                 return True
                 
             except Exception as err:
                 _LOGGER.error("WebSocket 连接失败: %s", err, exc_info=True)
                 self.connected = False
+                # WSS 地址可能带有已过期的签名，下次连接重新获取配置
+                self._mqtt_config_cache = None
+                # 连接失败由调用方处理，监听任务不应再触发重连
+                if self._listen_task and not self._listen_task.done():
+                    self._listen_task.cancel()
                 if self._websocket:
                     try:
                         await self._websocket.close()
                     except Exception:
                         pass
                     self._websocket = None
+                self._send = None
                 return False
 
     async def async_connect(self) -> bool:
         """Connect to MQTT broker (async version, compatible with previous version)."""
         return await self.connect()
 
-    async def _request_device_state(self) -> None:
-        """请求设备当前状态"""
-        if not self.connected or not self._websocket:
-            return
-        
-        try:
-            get_packet = self._build_mqtt_publish_packet(self.get_topic, {}, packet_id=3)
-            await self._websocket.send(get_packet)
-            _LOGGER.debug("已请求设备状态")
-        except Exception as err:
-            _LOGGER.error("请求设备状态失败: %s", err)
-
     async def async_set_temperature(self, temp_code: str) -> bool:
         """设置水温"""
         if not await self._ensure_connected():
             return False
         
         try:
-            temp_mapping = {
-                "0": 0, "1": 1, "2": 2, "3": 3, "4": 4,
-                "5": 5, "6": 6, "7": 7, "8": 8, "9": 9, "10": 10
-            }
-            
-            target_temp = temp_mapping.get(temp_code, 0)
+            target_temp = temp_code_to_set_temp(temp_code)
             
             # From WebSocket data analysis, the payload format should be simpler
             # Only include necessary fields
-            payload = {
-                "state": {
-                    "desired": {
-                        "SetTemp": target_temp,
-                        "CommandType": "app",
-                        "EnduserId": self.device_id
-                    }
-                }
-            }
-            
-            publish_packet = self._build_mqtt_publish_packet(self.command_topic, payload, packet_id=4)
-            await self._websocket.send(publish_packet)
+            if not await self._send_desired({"SetTemp": target_temp}):
+                return False
             
             _LOGGER.info("已发送水温设置指令: code=%s, temp=%s", temp_code, target_temp)
             return True
@@ -460,18 +558,8 @@ class DeermaMQTTClient:
             
             # From WebSocket data analysis, the payload format should be simpler
             # Only include necessary fields
-            payload = {
-                "state": {
-                    "desired": {
-                        "SetOutlet": target_volume,
-                        "CommandType": "app",
-                        "EnduserId": self.device_id
-                    }
-                }
-            }
-            
-            publish_packet = self._build_mqtt_publish_packet(self.command_topic, payload, packet_id=5)
-            await self._websocket.send(publish_packet)
+            if not await self._send_desired({"SetOutlet": target_volume}):
+                return False
             
             _LOGGER.info("已发送出水量设置指令: code=%s, SetOutlet=%s", volume_code, target_volume)
             return True
@@ -480,6 +568,42 @@ class DeermaMQTTClient:
             _LOGGER.error("设置出水量失败: %s", err)
             return False
 
+    async def _send_desired(self, desired: dict[str, int]) -> bool:
+        """把控制指令交给发送任务，返回是否发送成功"""
+        if self._writer_task is None or self._writer_task.done():
+            self._writer_task = self.hass.async_create_background_task(
+                self._writer(), f"deerma_mqtt_writer_{self.device_id}"
+            )
+        future = self.hass.loop.create_future()
+        self._tx_queue.put_nowait((desired, future))
+        return await future
+
+    async def _writer(self) -> None:
+        """单一发送任务：连续下发的指令合并后一次发送，同一字段以最后一次为准"""
+        while True:
+            desired, future = await self._tx_queue.get()
+            desired = dict(desired)
+            waiters = [future]
+            result = False
+            try:
+                # 稍等片刻，收集连续点击产生的指令
+                await asyncio.sleep(_TX_COALESCE_DELAY)
+                while not self._tx_queue.empty():
+                    more, future = self._tx_queue.get_nowait()
+                    desired.update(more)
+                    waiters.append(future)
+                
+                payload = self._build_command_payload(desired)
+                publish_packet = self._build_mqtt_publish_packet_raw(self.command_topic, payload, packet_id=4)
+                await self._send(publish_packet)
+                result = True
+            except Exception as err:
+                _LOGGER.error("发送控制指令失败: %s", err)
+            finally:
+                for future in waiters:
+                    if not future.done():
+                        future.set_result(result)
+
     async def _ensure_connected(self) -> bool:
         """确保MQTT连接"""
         if not self.connected:
@@ -488,7 +612,7 @@ class DeermaMQTTClient:
             except Exception as err:
                 _LOGGER.error("无法建立MQTT连接: %s", err)
                 return False
-        return self.connected
+        return self.connected and self._send is not None
 
     async def async_disconnect(self) -> None:
         """Disconnect from MQTT broker (async version, compatible with previous version)."""
@@ -496,9 +620,19 @@ class DeermaMQTTClient:
 
     async def disconnect(self) -> None:
         """断开MQTT连接"""
+        self._stopping = True
         self.connected = False
         self._listening = False
         
+        if self._reconnect_task and not self._reconnect_task.done():
+            self._reconnect_task.cancel()
+        if self._writer_task and not self._writer_task.done():
+            self._writer_task.cancel()
+        # 未发送的指令视为失败
+        while not self._tx_queue.empty():
+            _, future = self._tx_queue.get_nowait()
+            if not future.done():
+                future.set_result(False)
         if self._listen_task and not self._listen_task.done():
             try:
                 self._listen_task.cancel()
@@ -508,10 +642,11 @@ class DeermaMQTTClient:
         if self._websocket:
             try:
                 disconnect_packet = bytes([0xE0, 0x00])  # DISCONNECT 包
-                await self._websocket.send(disconnect_packet)
+                await self._send(disconnect_packet)
                 await self._websocket.close()
                 _LOGGER.info("WebSocket MQTT 连接已断开")
             except Exception as err:
                 _LOGGER.error("断开 WebSocket 连接时出错: %s", err)
         
         self._websocket = None
+        self._send = None
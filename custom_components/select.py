@@ -2,12 +2,13 @@
 from __future__ import annotations
 
 import logging
-from typing import Any
+import sys
+from types import MappingProxyType
+from typing import Any, Mapping
 
 from homeassistant.components.select import SelectEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
@@ -16,6 +17,34 @@ from .coordinator import DeermaWaterCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
+# Unit characters removed from option labels to get their numeric sort key
+_TEMP_STRIP = str.maketrans("", "", "℃°C")
+_VOLUME_STRIP = str.maketrans("", "", "mLl ")
+
+# Used when the device config has no valueMapping for the attribute
+_DEFAULT_TEMP_MAPPING = MappingProxyType({
+    "常温": "0",
+    "45℃": "1",
+    "65℃": "2",
+    "85°C": "3",
+    "99℃": "4",
+    "5℃": "5",
+    "55℃": "6",
+    "75℃": "7",
+    "95℃": "8",
+    "97℃": "9",
+    "100℃": "10",
+})
+_DEFAULT_VOLUME_MAPPING = MappingProxyType({
+    "200mL": "0",
+    "500mL": "1",
+    "1000mL": "2",
+    "1500mL": "3",
+    "250mL": "4",
+    "350mL": "5",
+    "2000mL": "6",
+})
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -25,9 +54,16 @@ async def async_setup_entry(
     """Set up Deerma Water Purifier select entities."""
     coordinator: DeermaWaterCoordinator = hass.data[DOMAIN][entry.entry_id]
 
+    # Parse the device's attribute config once for all selects
+    devices = entry.data.get("devices") or [{}]
+    value_mappings = {
+        attr.get("id"): attr.get("valueMapping", {})
+        for attr in devices[0].get("showAttributes", [])
+    }
+
     entities = [
-        DeermaTemperatureSelect(coordinator, entry),
-        DeermaWaterVolumeSelect(coordinator, entry),
+        DeermaTemperatureSelect(coordinator, entry, value_mappings.get("SetTemp")),
+        DeermaWaterVolumeSelect(coordinator, entry, value_mappings.get("SetOutlet")),
     ]
 
     async_add_entities(entities)
@@ -36,6 +72,8 @@ async def async_setup_entry(
 class DeermaBaseSelect(CoordinatorEntity, SelectEntity):
     """Base class for Deerma select entities."""
 
+    coordinator: DeermaWaterCoordinator
+
     def __init__(
         self,
         coordinator: DeermaWaterCoordinator,
@@ -43,14 +81,18 @@ class DeermaBaseSelect(CoordinatorEntity, SelectEntity):
     ) -> None:
         """Initialize the select entity."""
         super().__init__(coordinator)
-        self.coordinator = coordinator
         self._entry = entry
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, coordinator.device_id or "unknown")},
-            name=coordinator.device_name or "飞利浦水健康",
-            manufacturer="Deerma",
-            model="Water Purifier",
-        )
+        self._attr_device_info = coordinator.device_info
+        self._last_emitted: tuple | None = None  # Last state written to HA
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only when the selected option actually changed."""
+        state = (self.available, self.current_option)
+        if state == self._last_emitted:
+            return
+        self._last_emitted = state
+        super()._handle_coordinator_update()
 
 
 class DeermaTemperatureSelect(DeermaBaseSelect):
@@ -64,6 +106,7 @@ class DeermaTemperatureSelect(DeermaBaseSelect):
         self,
         coordinator: DeermaWaterCoordinator,
         entry: ConfigEntry,
+        value_mapping: Mapping[str, Any] | None = None,
     ) -> None:
         """Initialize the temperature select."""
         super().__init__(coordinator, entry)
@@ -71,52 +114,53 @@ class DeermaTemperatureSelect(DeermaBaseSelect):
         self._attr_name = "水温设置"
         
         # Get temperature mapping from device config
-        devices = entry.data.get("devices", [])
-        temp_mapping = {}
-        if devices and len(devices) > 0:
-            show_attrs = devices[0].get("showAttributes", [])
-            for attr in show_attrs:
-                if attr.get("id") == "SetTemp":
-                    value_mapping = attr.get("valueMapping", {})
-                    # Build options list and reverse mapping
-                    options = []
-                    for code, value in value_mapping.items():
-                        if isinstance(value, dict):
-                            # Handle localized values like {"zh-CN": "常温", "en": "Normal"}
-                            display_value = value.get("zh-CN") or value.get("en") or str(value)
-                        else:
-                            display_value = str(value)
-                        options.append(display_value)
-                        temp_mapping[display_value] = code
-                    self._attr_options = sorted(set(options), key=lambda x: (
-                        float(x.replace("℃", "").replace("°C", "").replace("常温", "0"))
-                        if x.replace("℃", "").replace("°C", "").replace("常温", "0").replace(".", "").isdigit()
-                        else 999
-                    ))
-                    self._temp_mapping = temp_mapping
-                    break
-        
-        # Fallback to default mapping if not found
-        if not hasattr(self, '_temp_mapping'):
-            self._temp_mapping = {
-                "常温": "0",
-                "45℃": "1",
-                "65℃": "2",
-                "85°C": "3",
-                "99℃": "4",
-                "5℃": "5",
-                "55℃": "6",
-                "75℃": "7",
-                "95℃": "8",
-                "97℃": "9",
-                "100℃": "10"
-            }
+        if value_mapping is not None:
+            temp_mapping = {}
+            # Build options list (with its sort key) and reverse mapping
+            keyed = []
+            for code, value in value_mapping.items():
+                if isinstance(value, dict):
+                    # Handle localized values like {"zh-CN": "常温", "en": "Normal"}
+                    display_value = value.get("zh-CN") or value.get("en") or str(value)
+                else:
+                    display_value = str(value)
+                # Shared by the options list, both mappings and the state machine
+                display_value = sys.intern(display_value)
+                stripped = display_value.translate(_TEMP_STRIP)
+                if "常温" in stripped:
+                    stripped = stripped.replace("常温", "0")
+                key = float(stripped) if stripped.replace(".", "").isdigit() else 999.0
+                keyed.append((key, display_value))
+                temp_mapping[display_value] = code
+            self._attr_options = [option for _, option in sorted(set(keyed))]
+            self._temp_mapping = MappingProxyType(temp_mapping)
+        else:
+            # Fallback to default mapping if not found
+            self._temp_mapping = _DEFAULT_TEMP_MAPPING
             self._attr_options = list(self._temp_mapping.keys())
+        # Reverse lookup used on every state read
+        self._code_to_option = MappingProxyType(
+            {str(code): option for option, code in self._temp_mapping.items()}
+        )
 
     @property
     def current_option(self) -> str | None:
         """Return the current selected option."""
-        data = self.coordinator.data or {}
+        temp_code_str = self._reported_code()
+        if temp_code_str is not None:
+            # Find option by code
+            option = self._code_to_option.get(temp_code_str)
+            if option is not None:
+                return option
+            
+            _LOGGER.warning("无法找到 SetTemp=%s 对应的选项，映射表: %s", temp_code_str, self._temp_mapping)
+        
+        # Default to first option
+        return self._attr_options[0] if self._attr_options else "常温"
+
+    def _reported_code(self) -> str | None:
+        """Return the temperature code reported by the device, if any."""
+        data = self.coordinator.safe_data
         # Get current temperature from MQTT data (SetTemp from shadow reported state)
         # MQTT callback already extracts reported state, so data should contain SetTemp directly
         temp_code = (
@@ -124,20 +168,7 @@ class DeermaTemperatureSelect(DeermaBaseSelect):
             or data.get("setTemp")
             or data.get("temperature_code")
         )
-        if temp_code is not None:
-            # Find option by code
-            temp_code_str = str(temp_code)
-            for option, code in self._temp_mapping.items():
-                if str(code) == temp_code_str:
-                    _LOGGER.debug("SetTemp=%s -> code=%s -> option=%s", temp_code, temp_code_str, option)
-                    return option
-            
-            _LOGGER.warning("无法找到 SetTemp=%s 对应的选项，映射表: %s", temp_code, self._temp_mapping)
-        
-        # Default to first option
-        default_option = self._attr_options[0] if self._attr_options else "常温"
-        _LOGGER.debug("使用默认选项: %s", default_option)
-        return default_option
+        return None if temp_code is None else str(temp_code)
 
     async def async_select_option(self, option: str) -> None:
         """Change the selected option."""
@@ -146,12 +177,12 @@ class DeermaTemperatureSelect(DeermaBaseSelect):
         if not temp_code:
             _LOGGER.error("Unknown temperature option: %s", option)
             return
+        # Nothing to send if the device already reports this setting
+        if str(temp_code) == self._reported_code():
+            return
         
         success = await self.coordinator.async_set_temperature(temp_code)
-        if success:
-            # Update local state immediately
-            await self.coordinator.async_request_refresh()
-        else:
+        if not success:
             _LOGGER.error("Failed to set temperature to %s", option)
 
 
@@ -166,6 +197,7 @@ class DeermaWaterVolumeSelect(DeermaBaseSelect):
         self,
         coordinator: DeermaWaterCoordinator,
         entry: ConfigEntry,
+        value_mapping: Mapping[str, Any] | None = None,
     ) -> None:
         """Initialize the water volume select."""
         super().__init__(coordinator, entry)
@@ -173,44 +205,47 @@ class DeermaWaterVolumeSelect(DeermaBaseSelect):
         self._attr_name = "出水量设置"
         
         # Get volume mapping from device config
-        devices = entry.data.get("devices", [])
-        volume_mapping = {}
-        if devices and len(devices) > 0:
-            show_attrs = devices[0].get("showAttributes", [])
-            for attr in show_attrs:
-                if attr.get("id") == "SetOutlet":
-                    value_mapping = attr.get("valueMapping", {})
-                    # Build options list and reverse mapping
-                    options = []
-                    for code, value in value_mapping.items():
-                        display_value = str(value)
-                        options.append(display_value)
-                        volume_mapping[display_value] = code
-                    self._attr_options = sorted(set(options), key=lambda x: (
-                        float(x.replace("mL", "").replace("ml", ""))
-                        if x.replace("mL", "").replace("ml", "").isdigit()
-                        else 999
-                    ))
-                    self._volume_mapping = volume_mapping
-                    break
-        
-        # Fallback to default mapping if not found
-        if not hasattr(self, '_volume_mapping'):
-            self._volume_mapping = {
-                "200mL": "0",
-                "500mL": "1",
-                "1000mL": "2",
-                "1500mL": "3",
-                "250mL": "4",
-                "350mL": "5",
-                "2000mL": "6"
-            }
+        if value_mapping is not None:
+            volume_mapping = {}
+            # Build options list (with its sort key) and reverse mapping
+            keyed = []
+            for code, value in value_mapping.items():
+                # Shared by the options list, both mappings and the state machine
+                display_value = sys.intern(str(value))
+                stripped = display_value.translate(_VOLUME_STRIP)
+                key = float(stripped) if stripped.isdigit() else 999.0
+                keyed.append((key, display_value))
+                volume_mapping[display_value] = code
+            self._attr_options = [option for _, option in sorted(set(keyed))]
+            self._volume_mapping = MappingProxyType(volume_mapping)
+        else:
+            # Fallback to default mapping if not found
+            self._volume_mapping = _DEFAULT_VOLUME_MAPPING
             self._attr_options = list(self._volume_mapping.keys())
+        # Reverse lookup used on every state read
+        self._code_to_option = MappingProxyType(
+            {str(code): option for option, code in self._volume_mapping.items()}
+        )
 
     @property
     def current_option(self) -> str | None:
         """Return the current selected option."""
-        data = self.coordinator.data or {}
+        code_str = self._reported_code()
+        if code_str is not None:
+            # Find option by code
+            option = self._code_to_option.get(code_str)
+            if option is not None:
+                return option
+            
+            _LOGGER.warning("无法找到 SetOutlet (code=%s) 对应的选项，映射表: %s", 
+                          code_str, self._volume_mapping)
+        
+        # Default to first option
+        return self._attr_options[0] if self._attr_options else "200mL"
+
+    def _reported_code(self) -> str | None:
+        """Return the volume code reported by the device, if any."""
+        data = self.coordinator.safe_data
         # Get current volume from MQTT data (SetOutlet from shadow reported state)
         # MQTT callback already extracts reported state, so data should contain SetOutlet directly
         volume_code = (
@@ -218,27 +253,14 @@ class DeermaWaterVolumeSelect(DeermaBaseSelect):
             or data.get("setOutlet")
             or data.get("volume_code")
         )
-        if volume_code is not None:
-            # From WebSocket data analysis: SetOutlet value directly corresponds to code in valueMapping
-            # SetOutlet=2 -> code "2" -> "1000mL"
-            # SetOutlet=4 -> code "4" -> "250mL"
-            # SetOutlet=5 -> code "5" -> "350mL"
-            # No conversion needed, SetOutlet value IS the code
-            code_str = str(int(volume_code)) if isinstance(volume_code, (int, float)) else str(volume_code)
-            
-            # Find option by code
-            for option, code in self._volume_mapping.items():
-                if str(code) == code_str:
-                    _LOGGER.debug("SetOutlet=%s -> code=%s -> option=%s", volume_code, code_str, option)
-                    return option
-            
-            _LOGGER.warning("无法找到 SetOutlet=%s (code=%s) 对应的选项，映射表: %s", 
-                          volume_code, code_str, self._volume_mapping)
-        
-        # Default to first option
-        default_option = self._attr_options[0] if self._attr_options else "200mL"
-        _LOGGER.debug("使用默认选项: %s", default_option)
-        return default_option
+        if volume_code is None:
+            return None
+        # From WebSocket data analysis: SetOutlet value directly corresponds to code in valueMapping
+        # SetOutlet=2 -> code "2" -> "1000mL"
+        # SetOutlet=4 -> code "4" -> "250mL"
+        # SetOutlet=5 -> code "5" -> "350mL"
+        # No conversion needed, SetOutlet value IS the code
+        return str(int(volume_code)) if isinstance(volume_code, (int, float)) else str(volume_code)
 
     async def async_select_option(self, option: str) -> None:
         """Change the selected option."""
@@ -247,10 +269,10 @@ class DeermaWaterVolumeSelect(DeermaBaseSelect):
         if not volume_code:
             _LOGGER.error("Unknown volume option: %s", option)
             return
+        # Nothing to send if the device already reports this setting
+        if str(volume_code) == self._reported_code():
+            return
         
         success = await self.coordinator.async_set_water_volume(volume_code)
-        if success:
-            # Update local state immediately
-            await self.coordinator.async_request_refresh()
-        else:
+        if not success:
             _LOGGER.error("Failed to set water volume to %s", option)
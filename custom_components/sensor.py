@@ -6,8 +6,7 @@ from typing import Any
 
 from homeassistant.components.sensor import SensorEntity, SensorStateClass
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.const import UnitOfVolume
@@ -25,6 +24,56 @@ from .coordinator import DeermaWaterCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
+# (data keys in order of preference, unique_id suffix, name, unit, icon)
+_FIELD_SENSORS: tuple[tuple[tuple[str, ...], str, str, str, str], ...] = (
+    (
+        (
+            "TapWaterTDS",  # From MQTT shadow
+            "TapWaterTds",
+            "tapWaterTds",
+            "tap_water_tds",
+            "input_tds",
+            "inputTds",
+        ),
+        "tap_water_tds", "自来水TDS", "ppm", "mdi:water-check",
+    ),
+    (
+        (
+            "TDS",  # From MQTT shadow
+            "Tds",
+            "tds",
+            "purified_tds",
+            "purifiedTds",
+            "output_tds",
+            "outputTds",
+        ),
+        "purified_tds", "净水TDS", "ppm", "mdi:water-check-outline",
+    ),
+    (
+        (
+            "AQPLife",  # From MQTT shadow
+            "AqpFilterLife",
+            "aqpFilterLife",
+            "aqp_filter_life",
+            "filter1_life",
+            "filter1Life",
+        ),
+        "aqp_filter_life", "AQP滤芯寿命", "%", "mdi:filter",
+    ),
+    (
+        (
+            "PC5in1Life",  # From MQTT shadow (actual field name)
+            "PC5IN1Life",  # Alternative case
+            "Pc5in1FilterLife",
+            "pc5in1FilterLife",
+            "pc5in1_filter_life",
+            "filter2_life",
+            "filter2Life",
+        ),
+        "pc5in1_filter_life", "PC5IN1滤芯寿命", "%", "mdi:filter-variant",
+    ),
+)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -36,10 +85,7 @@ async def async_setup_entry(
 
     entities = [
         DeermaTotalWaterSensor(coordinator, entry),
-        DeermaTapWaterTDSSensor(coordinator, entry),
-        DeermaPurifiedTDSSensor(coordinator, entry),
-        DeermaAQPFilterLifeSensor(coordinator, entry),
-        DeermaPC5IN1FilterLifeSensor(coordinator, entry),
+        *(DeermaFieldSensor(coordinator, entry, *spec) for spec in _FIELD_SENSORS),
     ]
 
     async_add_entities(entities)
@@ -48,6 +94,8 @@ async def async_setup_entry(
 class DeermaBaseSensor(CoordinatorEntity, SensorEntity):
     """Base class for Deerma sensor entities."""
 
+    coordinator: DeermaWaterCoordinator
+
     def __init__(
         self,
         coordinator: DeermaWaterCoordinator,
@@ -55,15 +103,19 @@ class DeermaBaseSensor(CoordinatorEntity, SensorEntity):
     ) -> None:
         """Initialize the sensor entity."""
         super().__init__(coordinator)
-        self.coordinator = coordinator
         self._entry = entry
         self._last_value = None  # Store last valid value
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, coordinator.device_id or "unknown")},
-            name=coordinator.device_name or "飞利浦水健康",
-            manufacturer="Deerma",
-            model="Water Purifier",
-        )
+        self._last_emitted: tuple | None = None  # Last state written to HA
+        self._attr_device_info = coordinator.device_info
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only when this sensor's state actually changed."""
+        state = (self.available, self.native_value, self.extra_state_attributes)
+        if state == self._last_emitted:
+            return
+        self._last_emitted = state
+        super()._handle_coordinator_update()
 
 
 class DeermaTotalWaterSensor(DeermaBaseSensor):
@@ -83,206 +135,83 @@ class DeermaTotalWaterSensor(DeermaBaseSensor):
         """Initialize the total water sensor."""
         super().__init__(coordinator, entry)
         self._attr_unique_id = f"{coordinator.device_id}_total_water"
+        # Attributes built from the coordinator data object they came from
+        self._attrs_source: dict | None = None
+        self._attrs: dict[str, Any] = {}
 
     @property
     def native_value(self) -> float | None:
         """Return the current value."""
-        data = self.coordinator.data or {}
-        # Use API data for total water consumption
+        # Use API data for total water consumption (parsed by the coordinator)
         # WaterVolume from MQTT is not the total water consumption
-        water_data = data.get("water_data", {})
-        total_data = water_data.get("total", {})
-        total_water = total_data.get("totalWater", 0.0)
-        
+        total_water = self.coordinator.total_water
         if total_water is not None:
-            try:
-                value = float(total_water)
-                self._last_value = value  # Update last valid value
-                return value
-            except (ValueError, TypeError):
-                pass
+            self._last_value = total_water  # Update last valid value
+            return total_water
         
         # Return last valid value if current value is None
-        return self._last_value if hasattr(self, '_last_value') else 0.0
+        return self._last_value
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return extra state attributes."""
-        data = self.coordinator.data or {}
+        data = self.coordinator.safe_data
+        # Rebuild only when the coordinator has published new data
+        if data is self._attrs_source:
+            return self._attrs
         water_data = data.get("water_data", {})
-        total_data = water_data.get("total", {})
         
-        return {
-            ATTR_TOTAL_WATER: total_data.get("totalWater", 0.0),
-            ATTR_AVG_TDS: total_data.get("averageTds", 0.0),
+        self._attrs = {
+            ATTR_TOTAL_WATER: self.coordinator.total_water,
+            ATTR_AVG_TDS: self.coordinator.avg_tds,
             "daily_data": water_data.get("daily", []),
             "weekly_data": water_data.get("weekly", []),
             "monthly_data": water_data.get("monthly", []),
         }
+        self._attrs_source = data
+        return self._attrs
 
 
-class DeermaTapWaterTDSSensor(DeermaBaseSensor):
-    """Sensor for tap water TDS value."""
-
-    _attr_unique_id = "deerma_tap_water_tds"
-    _attr_name = "自来水TDS"
-    _attr_native_unit_of_measurement = "ppm"
-    _attr_icon = "mdi:water-check"
-    _attr_state_class = SensorStateClass.MEASUREMENT
-
-    def __init__(
-        self,
-        coordinator: DeermaWaterCoordinator,
-        entry: ConfigEntry,
-    ) -> None:
-        """Initialize the tap water TDS sensor."""
-        super().__init__(coordinator, entry)
-        self._attr_unique_id = f"{coordinator.device_id}_tap_water_tds"
-
-    @property
-    def native_value(self) -> float | None:
-        """Return the current value."""
-        data = self.coordinator.data or {}
-        # Try MQTT data first (TapWaterTDS from shadow reported state)
-        tds = (
-            data.get("TapWaterTDS")  # From MQTT shadow
-            or data.get("TapWaterTds")
-            or data.get("tapWaterTds")
-            or data.get("tap_water_tds")
-            or data.get("input_tds")
-            or data.get("inputTds")
-        )
-        if tds is not None:
-            try:
-                value = float(tds)
-                self._last_value = value  # Update last valid value
-                return value
-            except (ValueError, TypeError):
-                pass
-        # Return last valid value if current value is None
-        return self._last_value
-
-
-class DeermaPurifiedTDSSensor(DeermaBaseSensor):
-    """Sensor for purified water TDS value."""
-
-    _attr_unique_id = "deerma_purified_tds"
-    _attr_name = "净水TDS"
-    _attr_native_unit_of_measurement = "ppm"
-    _attr_icon = "mdi:water-check-outline"
-    _attr_state_class = SensorStateClass.MEASUREMENT
-
-    def __init__(
-        self,
-        coordinator: DeermaWaterCoordinator,
-        entry: ConfigEntry,
-    ) -> None:
-        """Initialize the purified TDS sensor."""
-        super().__init__(coordinator, entry)
-        self._attr_unique_id = f"{coordinator.device_id}_purified_tds"
-
-    @property
-    def native_value(self) -> float | None:
-        """Return the current value."""
-        data = self.coordinator.data or {}
-        # Try MQTT data first (TDS from shadow reported state)
-        tds = (
-            data.get("TDS")  # From MQTT shadow
-            or data.get("Tds")
-            or data.get("tds")
-            or data.get("purified_tds")
-            or data.get("purifiedTds")
-            or data.get("output_tds")
-            or data.get("outputTds")
-        )
-        if tds is not None:
-            try:
-                value = float(tds)
-                self._last_value = value  # Update last valid value
-                return value
-            except (ValueError, TypeError):
-                pass
-        # Return last valid value if current value is None
-        return self._last_value
-
-
-class DeermaAQPFilterLifeSensor(DeermaBaseSensor):
-    """Sensor for AQP filter life."""
-
-    _attr_unique_id = "deerma_aqp_filter_life"
-    _attr_name = "AQP滤芯寿命"
-    _attr_native_unit_of_measurement = "%"
-    _attr_icon = "mdi:filter"
-    _attr_state_class = SensorStateClass.MEASUREMENT
-
-    def __init__(
-        self,
-        coordinator: DeermaWaterCoordinator,
-        entry: ConfigEntry,
-    ) -> None:
-        """Initialize the AQP filter life sensor."""
-        super().__init__(coordinator, entry)
-        self._attr_unique_id = f"{coordinator.device_id}_aqp_filter_life"
-
-    @property
-    def native_value(self) -> float | None:
-        """Return the current value."""
-        data = self.coordinator.data or {}
-        # Try MQTT data first (AQPLife from shadow reported state)
-        life = (
-            data.get("AQPLife")  # From MQTT shadow
-            or data.get("AqpFilterLife")
-            or data.get("aqpFilterLife")
-            or data.get("aqp_filter_life")
-            or data.get("filter1_life")
-            or data.get("filter1Life")
-        )
-        if life is not None:
-            try:
-                value = float(life)
-                self._last_value = value  # Update last valid value
-                return value
-            except (ValueError, TypeError):
-                pass
-        # Return last valid value if current value is None
-        return self._last_value
-
-
-class DeermaPC5IN1FilterLifeSensor(DeermaBaseSensor):
-    """Sensor for PC5IN1 filter life."""
+class DeermaFieldSensor(DeermaBaseSensor):
+    """Sensor for a numeric value (TDS, filter life) reported by the device."""
 
-    _attr_unique_id = "deerma_pc5in1_filter_life"
-    _attr_name = "PC5IN1滤芯寿命"
-    _attr_native_unit_of_measurement = "%"
-    _attr_icon = "mdi:filter-variant"
     _attr_state_class = SensorStateClass.MEASUREMENT
 
     def __init__(
         self,
         coordinator: DeermaWaterCoordinator,
         entry: ConfigEntry,
+        source_keys: tuple[str, ...],
+        unique_suffix: str,
+        name: str,
+        unit: str,
+        icon: str,
     ) -> None:
-        """Initialize the PC5IN1 filter life sensor."""
+        """Initialize the field sensor."""
         super().__init__(coordinator, entry)
-        self._attr_unique_id = f"{coordinator.device_id}_pc5in1_filter_life"
+        self._source_keys = source_keys
+        self._attr_unique_id = f"{coordinator.device_id}_{unique_suffix}"
+        self._attr_name = name
+        self._attr_native_unit_of_measurement = unit
+        self._attr_icon = icon
 
     @property
     def native_value(self) -> float | None:
         """Return the current value."""
-        data = self.coordinator.data or {}
-        # Try MQTT data first (PC5in1Life from shadow reported state - note the case)
-        life = (
-            data.get("PC5in1Life")  # From MQTT shadow (actual field name)
-            or data.get("PC5IN1Life")  # Alternative case
-            or data.get("Pc5in1FilterLife")
-            or data.get("pc5in1FilterLife")
-            or data.get("pc5in1_filter_life")
-            or data.get("filter2_life")
-            or data.get("filter2Life")
-        )
-        if life is not None:
+        data = self.coordinator.safe_data
+        # Try MQTT data first, then the API field names
+        value = None
+        for key in self._source_keys:
+            value = data.get(key)
+            if value is not None:
+                break
+        if isinstance(value, (int, float)):
+            # Values from MQTT JSON are already numeric
+            self._last_value = value
+            return value
+        if value is not None:
             try:
-                value = float(life)
+                value = float(value)
                 self._last_value = value  # Update last valid value
                 return value
             except (ValueError, TypeError):